@@ -6,6 +6,7 @@ Checks if your project is ready for Docker-free deployment
 
 import sys
 import os
+import importlib.util
 
 def check_python_version():
     """Check Python version"""
@@ -28,10 +29,10 @@ def check_pip_packages():
 
     missing_packages = []
     for package in required_packages:
-        try:
-            __import__(package)
+        # find_spec locates the package without running its import-time code
+        if importlib.util.find_spec(package) is not None:
             print(f"   ✅ {package} installed")
-        except ImportError:
+        else:
             missing_packages.append(package)
             print(f"   ❌ {package} missing")
 
@@ -48,7 +49,7 @@ def check_required_files():
 
     missing_files = []
     for file_path in required_files:
-        if os.path.exists(file_path):
+        if os.access(file_path, os.F_OK):
             print(f"   ✅ {file_path} exists")
         else:
             missing_files.append(file_path)
@@ -65,7 +66,7 @@ def check_database():
     ]
 
     for db_path in db_paths:
-        if os.path.exists(db_path):
+        if os.access(db_path, os.F_OK):
             print(f"   ✅ Database found: {db_path}")
             return True
 
@@ -1,21 +1,43 @@
 """
 Test script to inspect actual Bilka.dk HTML structure
 Run this locally to find the correct CSS selectors
+
+Usage: python inspect_bilka_structure.py [--cached] [URL ...]
+All URLs are inspected with a single Chrome session.
+--cached re-analyses the saved page dumps without starting Chrome.
 """
 
+import argparse
+import functools
+import hashlib
+import io
+import re
+import sys
+from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
+from selectolax.lexbor import LexborHTMLParser
 
-def inspect_bilka_page():
-    """Inspect Bilka.dk product page structure"""
-    
-    # Setup Chrome
+# Bilka laptops page
+DEFAULT_URL = "https://www.bilka.dk/elektronik/computere-og-gaming/computere/type/baerbar-computer/windows-computer/pl/windows-baerbar/"
+DUMP_PATH = 'data/bilka_page_dump.html'
+BLOCKED_URL_PATTERNS = ['*.png', '*.jpg', '*.jpeg', '*.webp', '*.gif', '*.svg', '*.woff', '*.woff2', '*.css']
+
+# Text checks for the detailed analysis, compiled once
+DIGIT_RE = re.compile(r'\d')
+PRICE_MARK_RE = re.compile(r'kr|,', re.I)
+DISCOUNT_RE = re.compile(r'%|spar', re.I)
+IMG_RE = re.compile(r'product|bilka', re.I)
+PRODUCT_HREF_RE = re.compile(r'/p/|/produkt')
+
+
+def build_driver() -> webdriver.Chrome:
+    """Start a headless Chrome session that can be reused for several pages"""
     chrome_options = Options()
     chrome_options.add_argument('--headless=new')
     chrome_options.add_argument('--no-sandbox')
@@ -23,10 +45,22 @@ def inspect_bilka_page():
     chrome_options.add_argument('--disable-blink-features=AutomationControlled')
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
-    
+
+    # Skip work the HTML inspection does not need
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-background-networking')
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    })
+    # Hand the page over once the DOM is ready; subresources are not needed
+    chrome_options.page_load_strategy = 'eager'
+
     # Add user agent
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-    
+
     # Use existing ChromeDriver from drivers folder
     try:
         driver = webdriver.Chrome(
@@ -37,130 +71,203 @@ def inspect_bilka_page():
         print(f"❌ Error starting ChromeDriver: {e}")
         print("Trying without specifying driver path...")
         driver = webdriver.Chrome(options=chrome_options)
-    
+
+    # Block the remaining heavy subresources at the network layer
     try:
-        # Navigate to Bilka laptops page
-        url = "https://www.bilka.dk/elektronik/computere-og-gaming/computere/type/baerbar-computer/windows-computer/pl/windows-baerbar/"
-        print(f"\n🔍 Inspecting: {url}\n")
-        
-        driver.get(url)
-        time.sleep(5)  # Wait for page to load
-        
-        # Get page source
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        print("=" * 80)
-        print("ANALYZING PAGE STRUCTURE")
-        print("=" * 80)
-        
-        # Look for common product container patterns
-        print("\n📦 Looking for product containers...\n")
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"⚠️  Could not block subresources: {e}")
+
+    return driver
+
+
+def fetch_html(driver: webdriver.Chrome, url: str) -> str:
+    """Load a URL and return its rendered HTML"""
+    print(f"\n🔍 Inspecting: {url}\n")
+
+    driver.get(url)
+
+    # Wait until something that looks like the product grid is present
+    try:
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, '[class*="product"], article, [data-product]'))
+        )
+        WebDriverWait(driver, 2).until(
+            lambda d: d.execute_script('return document.readyState') == 'complete'
+        )
+    except TimeoutException:
+        print("⚠️  Timed out waiting for products, inspecting the page as loaded so far")
+
+    return driver.page_source
+
+
+def dump_path_for(url: str) -> str:
+    """Dump file for a URL, so --cached never reuses another page's HTML"""
+    # Keep the familiar dump name for the default page
+    if url == DEFAULT_URL:
+        return DUMP_PATH
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+    return DUMP_PATH.replace('.html', f'_{digest}.html')
+
+
+def inspect_url(driver: webdriver.Chrome, url: str, dump_path: str = DUMP_PATH):
+    """Inspect the product page structure of a single URL"""
+    html = fetch_html(driver, url)
+
+    # Save full HTML first, so a failed analysis can be re-run with --cached
+    Path(dump_path).write_text(html, encoding='utf-8')
+    print(f"✅ Full HTML saved to: {dump_path}")
+
+    analyze_html(html, dump_path)
+
+
+def analyze_html(html: str, dump_path: str = DUMP_PATH):
+    """Print the product container analysis for a page's HTML"""
+    tree = LexborHTMLParser(html)
+
+    # Collect the report and write it in one go instead of a flush per line
+    report = io.StringIO()
+    out = functools.partial(print, file=report)
+    
+    out("=" * 80)
+    out("ANALYZING PAGE STRUCTURE")
+    out("=" * 80)
+    
+    # Look for common product container patterns
+    out("\n📦 Looking for product containers...\n")
+    
+    potential_containers = [
+        'article', 'div[data-product]', 'div[data-id]', '.product', '.item',
+        '[class*="product"]', '[class*="card"]', '[class*="item"]',
+        '[data-testid*="product"]', '[class*="tile"]', '[class*="grid-item"]'
+    ]
+    
+    found_containers = []
+    for selector in potential_containers:
+        elements = tree.css(selector)
+        if len(elements) > 5:  # Likely a product list if > 5 elements
+            found_containers.append((selector, len(elements)))
+            out(f"✓ Found {len(elements)} elements with selector: {selector}")
+    
+    if not found_containers:
+        out("❌ No obvious product containers found!")
+        out("\nLet's look at all elements with class containing 'product':")
+        all_with_product = tree.css('[class*="product" i]')
+        for elem in all_with_product[:5]:
+            out(f"  - {elem.tag} class='{elem.attributes.get('class')}'")
+    
+    # Analyze the first potential container in detail
+    if found_containers:
+        out("\n" + "=" * 80)
+        out("DETAILED ANALYSIS OF FIRST PRODUCT CONTAINER")
+        out("=" * 80)
         
-        potential_containers = [
-            'article', 'div[data-product]', 'div[data-id]', '.product', '.item',
-            '[class*="product"]', '[class*="card"]', '[class*="item"]',
-            '[data-testid*="product"]', '[class*="tile"]', '[class*="grid-item"]'
-        ]
+        best_selector, count = found_containers[0]
+        first_product = tree.css_first(best_selector)
         
-        found_containers = []
-        for selector in potential_containers:
-            elements = soup.select(selector)
-            if len(elements) > 5:  # Likely a product list if > 5 elements
-                found_containers.append((selector, len(elements)))
-                print(f"✓ Found {len(elements)} elements with selector: {selector}")
+        out(f"\n📋 Using selector: {best_selector}")
+        out(f"Found {count} products\n")
         
-        if not found_containers:
-            print("❌ No obvious product containers found!")
-            print("\nLet's look at all elements with class containing 'product':")
-            all_with_product = soup.find_all(class_=lambda x: x and 'product' in x.lower())
-            for elem in all_with_product[:5]:
-                print(f"  - {elem.name} class='{elem.get('class')}'")
+        # Look for product name
+        out("🏷️  Product Name - checking:")
+        for name_sel in ['h1', 'h2', 'h3', 'h4', '[class*="title"]', '[class*="name"]', 'a[href*="/p/"]']:
+            elem = first_product.css_first(name_sel)
+            if elem:
+                text = elem.text(strip=True)
+                if text and len(text) > 5:
+                    out(f"   ✓ {name_sel}: '{text[:60]}...'")
         
-        # Analyze the first potential container in detail
-        if found_containers:
-            print("\n" + "=" * 80)
-            print("DETAILED ANALYSIS OF FIRST PRODUCT CONTAINER")
-            print("=" * 80)
-            
-            best_selector, count = found_containers[0]
-            first_product = soup.select(best_selector)[0]
-            
-            print(f"\n📋 Using selector: {best_selector}")
-            print(f"Found {count} products\n")
-            
-            # Look for product name
-            print("🏷️  Product Name - checking:")
-            for name_sel in ['h1', 'h2', 'h3', 'h4', '[class*="title"]', '[class*="name"]', 'a[href*="/p/"]']:
-                elem = first_product.select_one(name_sel)
-                if elem:
-                    text = elem.get_text(strip=True)
-                    if text and len(text) > 5:
-                        print(f"   ✓ {name_sel}: '{text[:60]}...'")
-            
-            # Look for prices
-            print("\n💰 Prices - checking:")
-            for price_sel in ['[class*="price"]', '[class*="amount"]', '[data-price]', 'span', 'div']:
-                elems = first_product.select(price_sel)
-                for elem in elems:
-                    text = elem.get_text(strip=True)
-                    if any(char.isdigit() for char in text) and ('kr' in text.lower() or ',' in text):
-                        print(f"   ✓ {price_sel}: '{text}'")
-                        break
-            
-            # Look for discount
-            print("\n🏷️  Discount - checking:")
-            for disc_sel in ['[class*="discount"]', '[class*="save"]', '[class*="badge"]', '[class*="percent"]']:
-                elem = first_product.select_one(disc_sel)
-                if elem:
-                    text = elem.get_text(strip=True)
-                    if '%' in text or 'spar' in text.lower():
-                        print(f"   ✓ {disc_sel}: '{text}'")
-            
-            # Look for images
-            print("\n🖼️  Image - checking:")
-            imgs = first_product.select('img')
-            for img in imgs:
-                src = img.get('src', img.get('data-src', ''))
-                if src and 'product' in src.lower() or 'bilka' in src.lower():
-                    print(f"   ✓ img src: '{src[:80]}...'")
-                    break
-            
-            # Look for URLs
-            print("\n🔗 Product URL - checking:")
-            links = first_product.select('a[href]')
-            for link in links:
-                href = link.get('href', '')
-                if '/p/' in href or '/produkt' in href:
-                    print(f"   ✓ a[href]: '{href[:80]}...'")
+        # Look for prices
+        out("\n💰 Prices - checking:")
+        for price_sel in ['[class*="price"]', '[class*="amount"]', '[data-price]', 'span', 'div']:
+            elems = first_product.css(price_sel)
+            for elem in elems:
+                text = elem.text(strip=True)
+                if DIGIT_RE.search(text) and PRICE_MARK_RE.search(text):
+                    out(f"   ✓ {price_sel}: '{text}'")
                     break
-            
-            # Print full HTML of first product (truncated)
-            print("\n" + "=" * 80)
-            print("FIRST PRODUCT HTML (first 2000 chars):")
-            print("=" * 80)
-            print(str(first_product)[:2000])
-            print("...")
         
-        # Save full HTML for inspection
-        with open('data/bilka_page_dump.html', 'w', encoding='utf-8') as f:
-            f.write(html)
-        print("\n✅ Full HTML saved to: data/bilka_page_dump.html")
+        # Look for discount
+        out("\n🏷️  Discount - checking:")
+        for disc_sel in ['[class*="discount"]', '[class*="save"]', '[class*="badge"]', '[class*="percent"]']:
+            elem = first_product.css_first(disc_sel)
+            if elem:
+                text = elem.text(strip=True)
+                if DISCOUNT_RE.search(text):
+                    out(f"   ✓ {disc_sel}: '{text}'")
         
-        print("\n" + "=" * 80)
-        print("RECOMMENDATIONS")
-        print("=" * 80)
+        # Look for images
+        out("\n🖼️  Image - checking:")
+        imgs = first_product.css('img')
+        for img in imgs:
+            src = img.attributes.get('src') or img.attributes.get('data-src') or ''
+            if IMG_RE.search(src):
+                out(f"   ✓ img src: '{src[:80]}...'")
+                break
         
-        if found_containers:
-            print(f"\n✓ Use this as product_container: '{found_containers[0][0]}'")
-            print("\nUpdate config/scraping_rules.yaml with the selectors printed above.")
-        else:
-            print("\n⚠️  Could not find product containers automatically.")
-            print("Please inspect data/bilka_page_dump.html manually to find the correct selectors.")
+        # Look for URLs
+        out("\n🔗 Product URL - checking:")
+        links = first_product.css('a[href]')
+        for link in links:
+            href = link.attributes.get('href') or ''
+            if PRODUCT_HREF_RE.search(href):
+                out(f"   ✓ a[href]: '{href[:80]}...'")
+                break
         
+        # Print full HTML of first product (truncated)
+        out("\n" + "=" * 80)
+        out("FIRST PRODUCT HTML (first 2000 chars):")
+        out("=" * 80)
+        out(first_product.html[:2000])
+        out("...")
+    
+    out("\n" + "=" * 80)
+    out("RECOMMENDATIONS")
+    out("=" * 80)
+    
+    if found_containers:
+        out(f"\n✓ Use this as product_container: '{found_containers[0][0]}'")
+        out("\nUpdate config/scraping_rules.yaml with the selectors printed above.")
+    else:
+        out("\n⚠️  Could not find product containers automatically.")
+        out(f"Please inspect {dump_path} manually to find the correct selectors.")
+
+    sys.stdout.write(report.getvalue())
+    sys.stdout.flush()
+
+
+def inspect_bilka_page(urls=None, cached=False):
+    """Inspect Bilka.dk product page structure"""
+    urls = urls or [DEFAULT_URL]
+
+    driver = None
+    try:
+        for url in urls:
+            dump_path = dump_path_for(url)
+
+            if cached and Path(dump_path).exists():
+                print(f"\n📄 Using cached HTML for {url}: {dump_path}\n")
+                analyze_html(Path(dump_path).read_text(encoding='utf-8'), dump_path)
+                continue
+
+            # Only start Chrome once a page actually has to be fetched
+            if driver is None:
+                driver = build_driver()
+            inspect_url(driver, url, dump_path)
     finally:
-        driver.quit()
+        if driver is not None:
+            driver.quit()
 
 
 if __name__ == "__main__":
-    inspect_bilka_page()
+    parser = argparse.ArgumentParser(description="Inspect Bilka.dk HTML structure")
+    parser.add_argument("urls", nargs="*", help=f"Pages to inspect (default: {DEFAULT_URL})")
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="Re-analyse previously saved page dumps instead of fetching them again"
+    )
+    args = parser.parse_args()
+
+    inspect_bilka_page(args.urls, cached=args.cached)
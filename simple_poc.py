@@ -8,8 +8,11 @@ No external dependencies required - runs entirely locally
 import streamlit as st
 import pandas as pd
 import sqlite3
-import time
-from datetime import datetime, timedelta
+import logging
+import atexit
+import threading
+import itertools
+from contextlib import contextmanager
 import sys
 import os
 from pathlib import Path
@@ -31,27 +34,107 @@ else:
 from src.data.storage import DataStorage
 from src.analysis.discount_analyzer import DiscountAnalyzer
 
+logger = logging.getLogger(__name__)
+
 # Configuration
 MAX_RECORDS = 2000  # Limit database to 2000 records max
 DB_PATH = "data/bilka_poc.db"
 SCRAPE_INTERVAL = 300  # 5 minutes between scrapes
+INSERT_BATCH_ROWS = 500  # rows per multi-row INSERT (7 params each, well under SQLite's limit)
+# scraped_at is left to the column's CURRENT_TIMESTAMP default
+PRODUCT_INSERT_COLUMNS = (
+    "name, current_price, original_price, discount_percentage, "
+    "category, url, image_url"
+)
+
+# Hot queries that must be answered from idx_products_scraped_at
+INDEXED_QUERIES = [
+    "SELECT * FROM products ORDER BY scraped_at DESC LIMIT 100",
+    "DELETE FROM products WHERE scraped_at < datetime('now', '-7 days')",
+    f"SELECT scraped_at, id FROM products ORDER BY scraped_at DESC, id DESC LIMIT 1 OFFSET {MAX_RECORDS - 101}",
+]
+
+PRICE_COLUMNS = ['current_price', 'original_price', 'discount_percentage']
+
+
+def products_to_rows(products, category):
+    """
+    Turn scraped product dicts into INSERT rows, one column at a time
+
+    Rows without a name would violate NOT NULL and are dropped; prices that
+    are not numeric become NULL.
+    """
+    frame = pd.DataFrame.from_records(products).reindex(
+        columns=['name', *PRICE_COLUMNS, 'url', 'image_url']
+    )
+    frame = frame[frame['name'].notna()]
+    for column in PRICE_COLUMNS:
+        prices = pd.to_numeric(frame[column], errors='coerce')
+        frame[column] = prices.astype(object).where(prices.notna(), None)
+    frame[['url', 'image_url']] = frame[['url', 'image_url']].fillna('')
+    frame.insert(4, 'category', category)
+    return list(frame.itertuples(index=False, name=None))
+
 
 class SimpleBilkaMonitor:
     """Simple Bilka Price Monitor for POC"""
 
     def __init__(self):
         self.db_path = DB_PATH
+        # The monitor (its connection and browser) is shared by all Streamlit
+        # sessions: one lock per shared resource
+        self._db_lock = threading.Lock()
+        self._scrape_lock = threading.Lock()
         self.setup_database()
         self.scraper = BilkaScraper()
         self.storage = DataStorage(database_url=f"sqlite:///{self.db_path}")
         self.analyzer = DiscountAnalyzer()
+        # The cached monitor lives as long as the Streamlit process
+        atexit.register(self.close)
+
+    def close(self):
+        """Release the browser session, database engine and connection (safe to call twice)"""
+        session_manager = getattr(self.scraper, 'session_manager', None)
+        if session_manager is not None:
+            session_manager.close()
+        self.storage.engine.dispose()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self):
+        """Open a database connection tuned for small, frequent writes"""
+        # Autocommit mode: writes group themselves with _transaction()
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        # PRAGMAs are per connection: WAL lets the dashboard read while a scrape
+        # writes, and NORMAL sync avoids an fsync on every commit
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")  # 20 MB page cache
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements in one explicit transaction"""
+        with self._db_lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     def setup_database(self):
         """Create simple database schema"""
         os.makedirs("data", exist_ok=True)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # One connection for the monitor's lifetime
+        self._conn = self._connect()
+        cursor = self._conn.cursor()
 
         # Create products table
         cursor.execute('''
@@ -69,6 +152,17 @@ class SimpleBilkaMonitor:
             )
         ''')
 
+        # Recent-products reads and retention cleanup both order by scraped_at;
+        # id breaks ties between rows stamped in the same second
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_products_scraped_at_id "
+            "ON products(scraped_at DESC, id DESC)"
+        )
+        # Superseded by idx_products_scraped_at_id
+        cursor.execute("DROP INDEX IF EXISTS idx_products_scraped_at")
+        # No query reads this partial index, but every insert had to maintain it
+        cursor.execute("DROP INDEX IF EXISTS idx_products_discount")
+
         # Create scrape_log table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS scrape_log (
@@ -79,102 +173,109 @@ class SimpleBilkaMonitor:
             )
         ''')
 
-        conn.commit()
-        conn.close()
+        self._check_query_plans()
+
+    def _check_query_plans(self):
+        """Warn if a hot query no longer uses the scraped_at index"""
+        for query in INDEXED_QUERIES:
+            plan = self._conn.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+            details = " | ".join(row[-1] for row in plan)
+            if "idx_products_scraped_at_id" not in details or "TEMP B-TREE" in details:
+                logger.warning(f"Query not using idx_products_scraped_at_id: {query} -> {details}")
 
     def cleanup_old_data(self):
         """Keep only recent data to stay within limits"""
-        conn = sqlite3.connect(self.db_path)
+        with self._transaction() as conn:
+            self._delete_old_rows(conn)
+
+    def _delete_old_rows(self, conn):
+        """Apply the retention rules inside the caller's transaction"""
         cursor = conn.cursor()
 
-        # Keep only last 7 days of data
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        cursor.execute("DELETE FROM products WHERE scraped_at < ?", (seven_days_ago,))
+        # Keep only last 7 days of data (scraped_at is SQLite's UTC CURRENT_TIMESTAMP)
+        cursor.execute("DELETE FROM products WHERE scraped_at < datetime('now', '-7 days')")
 
         # If still too many records, keep only the most recent
         cursor.execute("SELECT COUNT(*) FROM products")
         count = cursor.fetchone()[0]
 
         if count > MAX_RECORDS:
-            # Keep only the most recent records
+            # Keep only the most recent records: look up the keep_count-th
+            # newest row, then range-delete everything older than it. A whole
+            # scrape shares one CURRENT_TIMESTAMP second, so ties go by id.
             keep_count = MAX_RECORDS - 100  # Leave some buffer
-            cursor.execute(f"""
-                DELETE FROM products
-                WHERE id NOT IN (
-                    SELECT id FROM products
-                    ORDER BY scraped_at DESC
-                    LIMIT {keep_count}
-                )
-            """)
-
-        conn.commit()
-        conn.close()
+            pivot = cursor.execute("""
+                SELECT scraped_at, id FROM products
+                ORDER BY scraped_at DESC, id DESC
+                LIMIT 1 OFFSET ?
+            """, (keep_count - 1,)).fetchone()
+            if pivot is not None:
+                cursor.execute("DELETE FROM products WHERE (scraped_at, id) < (?, ?)", pivot)
 
     def scrape_and_store(self, category="electronics", max_products=50):
         """Scrape products and store in database"""
         try:
-            # Scrape products
-            products = self.scraper.scrape_category(category, max_products=max_products)
+            # Scrape products; a scrape closes the shared browser session when
+            # it finishes, so two sessions must not scrape at once
+            with self._scrape_lock:
+                products = self.scraper.scrape_category(category, max_products=max_products)
 
             if not products:
                 return {"status": "error", "message": "No products found"}
 
-            # Store in database
-            stored_count = 0
-            conn = sqlite3.connect(self.db_path)
-
-            for product in products:
-                try:
-                    conn.execute('''
-                        INSERT INTO products
-                        (name, current_price, original_price, discount_percentage,
-                         category, url, image_url, scraped_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        product.get('name', ''),
-                        product.get('current_price'),
-                        product.get('original_price'),
-                        product.get('discount_percentage'),
-                        category,
-                        product.get('url', ''),
-                        product.get('image_url', ''),
-                        datetime.now()
-                    ))
-                    stored_count += 1
-                except Exception as e:
-                    continue  # Skip problematic products
-
-            # Log the scrape
-            conn.execute('''
-                INSERT INTO scrape_log (products_found, status)
-                VALUES (?, ?)
-            ''', (stored_count, "success"))
-
-            conn.commit()
-            conn.close()
-
-            # Cleanup old data
-            self.cleanup_old_data()
+            # Store in database; SQLite stamps scraped_at for the whole batch.
+            rows = products_to_rows(products, category)
+            stored_count = len(rows)
+
+            with self._transaction() as conn:
+                # One multi-row INSERT per chunk instead of a statement per row
+                for start in range(0, len(rows), INSERT_BATCH_ROWS):
+                    chunk = rows[start:start + INSERT_BATCH_ROWS]
+                    placeholders = ", ".join(["(?, ?, ?, ?, ?, ?, ?)"] * len(chunk))
+                    conn.execute(
+                        f"INSERT INTO products ({PRODUCT_INSERT_COLUMNS}) VALUES {placeholders}",
+                        list(itertools.chain.from_iterable(chunk))
+                    )
+
+                # Log the scrape
+                conn.execute('''
+                    INSERT INTO scrape_log (products_found, status)
+                    VALUES (?, ?)
+                ''', (stored_count, "success"))
+
+                # Cleanup old data in the same commit
+                self._delete_old_rows(conn)
 
             return {
                 "status": "success",
                 "products_stored": stored_count,
-                "total_products": len(products)
+                "total_products": len(products),
+                # Fresh dashboard numbers, so the page need not query them again
+                "stats": self._read_stats()
             }
 
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    def _query_frame(self, sql, params=()):
+        """Run a small query and build the DataFrame straight from the cursor rows"""
+        with self._db_lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+        return pd.DataFrame.from_records(rows, columns=columns)
+
     def get_recent_products(self, limit=100):
         """Get recent products from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            df = pd.read_sql_query('''
-                SELECT * FROM products
+            df = self._query_frame('''
+                SELECT id, name, current_price, original_price, discount_percentage,
+                       category, url, image_url, scraped_at
+                FROM products
                 ORDER BY scraped_at DESC
                 LIMIT ?
-            ''', conn, params=(limit,))
-            conn.close()
+            ''', (limit,))
+            df['scraped_at'] = pd.to_datetime(df['scraped_at'], format='ISO8601')
             return df
         except Exception as e:
             return pd.DataFrame()
@@ -182,42 +283,7 @@ class SimpleBilkaMonitor:
     def get_dashboard_stats(self):
         """Get statistics for dashboard"""
         try:
-            conn = sqlite3.connect(self.db_path)
-
-            # Total products
-            total_products = pd.read_sql_query(
-                "SELECT COUNT(*) as count FROM products", conn
-            ).iloc[0]['count']
-
-            # Products with discounts
-            discounted_products = pd.read_sql_query('''
-                SELECT COUNT(*) as count FROM products
-                WHERE discount_percentage > 0
-            ''', conn).iloc[0]['count']
-
-            # Average discount
-            avg_discount = pd.read_sql_query('''
-                SELECT AVG(discount_percentage) as avg
-                FROM products
-                WHERE discount_percentage > 0
-            ''', conn).iloc[0]['avg']
-
-            # Recent scrapes
-            recent_scrapes = pd.read_sql_query('''
-                SELECT * FROM scrape_log
-                ORDER BY timestamp DESC
-                LIMIT 5
-            ''', conn)
-
-            conn.close()
-
-            return {
-                "total_products": total_products,
-                "discounted_products": discounted_products,
-                "avg_discount": avg_discount or 0,
-                "recent_scrapes": recent_scrapes
-            }
-
+            return self._read_stats()
         except Exception as e:
             return {
                 "total_products": 0,
@@ -226,65 +292,62 @@ class SimpleBilkaMonitor:
                 "recent_scrapes": pd.DataFrame()
             }
 
-def main():
-    """Main Streamlit application"""
-    st.set_page_config(
-        page_title="Bilka Price Monitor - POC",
-        page_icon="🛒",
-        layout="wide"
-    )
+    def _read_stats(self):
+        """Query the dashboard totals and the latest scrape log entries"""
+        # Totals, discounted count and average discount in one scan
+        with self._db_lock:
+            total_products, discounted_products, avg_discount = self._conn.execute('''
+                SELECT
+                    COUNT(*),
+                    COUNT(CASE WHEN discount_percentage > 0 THEN 1 END),
+                    AVG(CASE WHEN discount_percentage > 0 THEN discount_percentage END)
+                FROM products
+            ''').fetchone()
 
-    st.title("🛒 Bilka Price Monitor - POC")
-    st.markdown("**Web-based price monitoring for BILKA.dk with advanced anomaly detection**")
-    st.markdown("---")
+        # Recent scrapes
+        recent_scrapes = self._query_frame('''
+            SELECT * FROM scrape_log
+            ORDER BY timestamp DESC
+            LIMIT 5
+        ''')
 
-    # Initialize monitor
-    monitor = SimpleBilkaMonitor()
+        return {
+            "total_products": total_products,
+            "discounted_products": discounted_products,
+            "avg_discount": avg_discount or 0,
+            "recent_scrapes": recent_scrapes
+        }
 
-    # Sidebar for controls
-    with st.sidebar:
-        st.header("⚙️ Controls")
+def format_column(values, template, missing):
+    """Format a numeric column with one bound str.format, leaving NaN as `missing`"""
+    return values.map(template.format, na_action='ignore').fillna(missing)
 
-        # Scrape controls
-        st.subheader("🔍 Scrape Products")
-        category = st.selectbox(
-            "Category",
-            ["electronics", "home", "sports", "clothing"],
-            help="Select product category to scrape"
-        )
 
-        max_products = st.slider(
-            "Max Products",
-            min_value=10,
-            max_value=100,
-            value=30,
-            help="Maximum products to scrape per session"
-        )
+@st.cache_data(ttl=60)
+def load_recent_products(db_path, limit, _monitor):
+    """Recent products, cached per database and limit across reruns"""
+    return _monitor.get_recent_products(limit)
 
-        if st.button("🚀 Scrape Now", type="primary"):
-            with st.spinner("Scraping products from BILKA.dk..."):
-                result = monitor.scrape_and_store(category, max_products)
 
-            if result["status"] == "success":
-                st.success(f"✅ Scraped {result['products_stored']} products successfully!")
-                st.rerun()
-            else:
-                st.error(f"❌ Scraping failed: {result['message']}")
+@st.cache_data(ttl=60)
+def load_dashboard_stats(db_path, _monitor):
+    """Dashboard statistics, cached per database across reruns"""
+    return _monitor.get_dashboard_stats()
 
-        st.markdown("---")
 
-        # Auto-refresh toggle
-        auto_refresh = st.checkbox("Auto-refresh every 5 minutes", value=False)
+@st.cache_resource
+def get_monitor():
+    """Build the monitor, its database connection and scraper once per process"""
+    return SimpleBilkaMonitor()
 
-        # Manual refresh
-        if st.button("🔄 Refresh Data"):
-            st.rerun()
 
+def show_dashboard_data(monitor):
+    """Metrics, recent products and scrape activity"""
     # Main content
     col1, col2, col3, col4 = st.columns(4)
 
     # Get stats
-    stats = monitor.get_dashboard_stats()
+    stats = st.session_state.pop('last_stats', None) or load_dashboard_stats(monitor.db_path, monitor)
 
     with col1:
         st.metric("📊 Total Products", f"{stats['total_products']:,}")
@@ -303,21 +366,16 @@ def main():
     # Products table
     st.subheader("📋 Recent Products")
 
-    df = monitor.get_recent_products(100)
+    df = load_recent_products(monitor.db_path, 100, monitor)
 
     if not df.empty:
         # Format the dataframe for display
         display_df = df.copy()
-        display_df['current_price'] = display_df['current_price'].apply(
-            lambda x: f"kr {x:.2f}" if pd.notna(x) else "N/A"
-        )
-        display_df['original_price'] = display_df['original_price'].apply(
-            lambda x: f"kr {x:.2f}" if pd.notna(x) else "N/A"
-        )
-        display_df['discount_percentage'] = display_df['discount_percentage'].apply(
-            lambda x: f"{x:.1f}%" if pd.notna(x) and x > 0 else ""
-        )
-        display_df['scraped_at'] = pd.to_datetime(display_df['scraped_at']).dt.strftime('%Y-%m-%d %H:%M')
+        display_df['current_price'] = format_column(display_df['current_price'], "kr {:.2f}", "N/A")
+        display_df['original_price'] = format_column(display_df['original_price'], "kr {:.2f}", "N/A")
+        discount = display_df['discount_percentage']
+        display_df['discount_percentage'] = format_column(discount.where(discount > 0), "{:.1f}%", "")
+        display_df['scraped_at'] = display_df['scraped_at'].dt.strftime('%Y-%m-%d %H:%M')
 
         # Rename columns for display
         display_df = display_df.rename(columns={
@@ -338,7 +396,8 @@ def main():
 
         # Export functionality
         if st.button("📥 Export to CSV"):
-            csv = display_df.to_csv(index=False)
+            # Export the typed values, not the "kr 12.34" display strings
+            csv = df.to_csv(index=False).encode('utf-8')
             st.download_button(
                 label="Download CSV",
                 data=csv,
@@ -354,21 +413,81 @@ def main():
     st.subheader("📈 Recent Activity")
 
     if not stats['recent_scrapes'].empty:
-        for _, scrape in stats['recent_scrapes'].head(3).iterrows():
-            timestamp = pd.to_datetime(scrape['timestamp']).strftime('%H:%M:%S')
-            status = "✅" if scrape['status'] == 'success' else "❌"
-            st.write(f"{status} {timestamp}: {scrape['products_found']} products scraped")
+        recent = stats['recent_scrapes'].head(3)
+        times = pd.to_datetime(recent['timestamp']).dt.strftime('%H:%M:%S')
+        for timestamp, status, products_found in zip(times, recent['status'], recent['products_found']):
+            status = "✅" if status == 'success' else "❌"
+            st.write(f"{status} {timestamp}: {products_found} products scraped")
     else:
         st.write("No recent scraping activity")
 
+
+def main():
+    """Main Streamlit application"""
+    st.set_page_config(
+        page_title="Bilka Price Monitor - POC",
+        page_icon="🛒",
+        layout="wide"
+    )
+
+    st.title("🛒 Bilka Price Monitor - POC")
+    st.markdown("**Web-based price monitoring for BILKA.dk with advanced anomaly detection**")
+    st.markdown("---")
+
+    # Initialize monitor (built once, then shared across reruns)
+    monitor = get_monitor()
+
+    # Sidebar for controls
+    with st.sidebar:
+        st.header("⚙️ Controls")
+
+        # Scrape controls
+        st.subheader("🔍 Scrape Products")
+        category = st.selectbox(
+            "Category",
+            ["electronics", "home", "sports", "clothing"],
+            help="Select product category to scrape"
+        )
+
+        max_products = st.slider(
+            "Max Products",
+            min_value=10,
+            max_value=100,
+            value=30,
+            help="Maximum products to scrape per session"
+        )
+
+        if st.button("🚀 Scrape Now", type="primary"):
+            with st.spinner("Scraping products from BILKA.dk..."):
+                result = monitor.scrape_and_store(category, max_products)
+
+            if result["status"] == "success":
+                # New rows are in; drop the cached tables and stats, and show
+                # the totals the scrape already computed on the next run
+                st.cache_data.clear()
+                st.session_state['last_stats'] = result['stats']
+                st.success(f"✅ Scraped {result['products_stored']} products successfully!")
+                st.rerun()
+            else:
+                st.error(f"❌ Scraping failed: {result['message']}")
+
+        st.markdown("---")
+
+        # Auto-refresh toggle
+        auto_refresh = st.checkbox("Auto-refresh every 5 minutes", value=False)
+
+        # Manual refresh
+        if st.button("🔄 Refresh Data"):
+            st.cache_data.clear()
+            st.rerun()
+
+    # Only the data section reruns on the auto-refresh timer
+    refresh_every = SCRAPE_INTERVAL if auto_refresh else None
+    st.fragment(run_every=refresh_every)(show_dashboard_data)(monitor)
+
     # Footer
     st.markdown("---")
     st.markdown("*Built as a Proof of Concept - Limited to ~2000 records for performance*")
 
-    # Auto-refresh logic
-    if auto_refresh:
-        time.sleep(SCRAPE_INTERVAL)
-        st.rerun()
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,13 +1,36 @@
 """
 Analysis module for discount analysis and anomaly detection
+
+Submodules are imported on first attribute access (PEP 562), so importing
+one analyzer does not load the others.
 """
 
-from .discount_analyzer import DiscountAnalyzer, analyze_product_discounts
-from .price_validator import PriceValidator, validate_product_prices
-from .anomaly_detector import AnomalyDetector, detect_suspicious_deals
+import importlib
+
+_LAZY = {
+    'DiscountAnalyzer': 'discount_analyzer',
+    'analyze_product_discounts': 'discount_analyzer',
+    'PriceValidator': 'price_validator',
+    'validate_product_prices': 'price_validator',
+    'AnomalyDetector': 'anomaly_detector',
+    'detect_suspicious_deals': 'anomaly_detector',
+}
 
 __all__ = [
     'DiscountAnalyzer', 'analyze_product_discounts',
     'PriceValidator', 'validate_product_prices',
     'AnomalyDetector', 'detect_suspicious_deals'
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
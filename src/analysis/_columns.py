@@ -0,0 +1,44 @@
+"""
+Column access shared by the analyzers
+
+Each helper reads one DataFrame column as a NumPy array, treating a missing
+column the way the old per-row ``row.get(column)`` lookups did.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def take(df: pd.DataFrame, column: str, rows: np.ndarray, default=None) -> list:
+    """Return a column's values at ``rows`` as Python scalars (``default`` if missing)"""
+    if column not in df.columns:
+        return [default] * len(rows)
+    return df[column].to_numpy()[rows].tolist()
+
+
+def float_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Return a numeric column as float64 (missing values and columns become NaN)"""
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    # float64 on purpose: in float32, 95.000001 no longer passes `> 95`, 69.999999
+    # passes `>= 70`, and the recomputed discounts in the error descriptions
+    # drift. float64 columns (what storage returns) are read without a copy.
+    values = df[column]
+    if values.dtype == np.float64:
+        return values.to_numpy()
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def truthy(df: pd.DataFrame, column: str, default=None) -> np.ndarray:
+    """
+    Mask of the values an ``if value`` check accepts
+
+    Python truthiness, applied per value: NaN is truthy; None, 0 and '' are
+    not. A missing column counts as ``default`` in every row.
+    """
+    if column not in df.columns:
+        return np.full(len(df), bool(default))
+    values = df[column].to_numpy()
+    if values.dtype == object:
+        return ~((values == None) | (values == 0) | (values == ''))  # noqa: E711
+    return values != 0
@@ -6,12 +6,23 @@ This module specifically focuses on detecting unnaturally good offers
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, fields
+from itertools import chain
 from datetime import datetime, timedelta
 import logging
+import re
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy kernels below are used instead
+    njit = None
 
 logger = logging.getLogger(__name__)
 
+# Premium brands, matched against lowercased product names
+_PREMIUM_RE = re.compile(r'samsung|apple|sony')
+
 
 @dataclass
 class AnomalyResult:
@@ -27,6 +38,214 @@ class AnomalyResult:
     recommendation: str
 
 
+# Detectors return one row per anomaly with these columns (AnomalyResult field order)
+RESULT_COLUMNS = [f.name for f in fields(AnomalyResult)]
+
+
+def _result_frame(rows: int, **columns) -> pd.DataFrame:
+    """Columnar detector output; scalar values are broadcast to every row"""
+    return pd.DataFrame(columns, index=pd.RangeIndex(rows), columns=RESULT_COLUMNS)
+
+
+def _to_results(frame: pd.DataFrame) -> List[AnomalyResult]:
+    """Convert a result frame into AnomalyResult objects for callers"""
+    return [AnomalyResult(*values) for values in frame[RESULT_COLUMNS].itertuples(index=False, name=None)]
+
+
+@dataclass
+class _ProductColumns:
+    """Product columns shared by the detectors, read from the frame once per scan"""
+    frame: pd.DataFrame
+    names: np.ndarray
+    current: Optional[np.ndarray]
+    original: Optional[np.ndarray]
+    discount: Optional[np.ndarray]
+    savings: Optional[np.ndarray]  # original - current, computed once
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> '_ProductColumns':
+        # float64 on purpose: in float32, 66.7 no longer matches np.isin([66.7]),
+        # 94.999999 rounds up to pass `>= 95`, and result prices would show the
+        # rounding. float64 columns (what storage returns) are read without a copy.
+        def prices(column: str) -> Optional[np.ndarray]:
+            return df[column].to_numpy(dtype=np.float64) if column in df.columns else None
+
+        if 'name' in df.columns:
+            names = df['name'].to_numpy(dtype=object)
+        else:
+            names = np.full(len(df), 'Unknown', dtype=object)
+        current, original = prices('current_price'), prices('original_price')
+        savings = original - current if current is not None and original is not None else None
+        return cls(df, names, current, original, prices('discount_percentage'), savings)
+
+    @staticmethod
+    def at(values: Optional[np.ndarray], rows: np.ndarray) -> Optional[np.ndarray]:
+        """Values at positional rows, or None for a missing column"""
+        return None if values is None else values[rows]
+
+
+def _zscore_hits_numpy(deviations: np.ndarray, std: float, threshold: float,
+                       min_confidence: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions and z-scores of deviations beyond the threshold"""
+    z_scores = deviations / std
+    confidence = np.abs(z_scores)
+    confidence /= 5.0
+    np.minimum(confidence, 1.0, out=confidence)
+    hits = (z_scores > threshold) & (confidence >= min_confidence)
+    return np.flatnonzero(hits), z_scores[hits]
+
+
+def _iqr_hits_numpy(discounts: np.ndarray, upper_bound: float, iqr: float,
+                    min_confidence: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Row positions and confidences of discounts beyond the IQR upper bound"""
+    with np.errstate(invalid='ignore'):
+        outlier = (discounts > upper_bound) & (discounts > 0)
+    if iqr > 0:
+        deviation = (discounts[outlier] - upper_bound) / iqr
+    else:
+        deviation = np.zeros(int(outlier.sum()))
+    confidence = np.clip(0.5 + deviation * 0.2, 0.0, 1.0)
+
+    keep = confidence >= min_confidence
+    return np.flatnonzero(outlier)[keep], confidence[keep]
+
+
+# Too-good-to-be-true discount tiers: [80, 90) high, [90, 95) very high, 95+ extreme
+_DISCOUNT_TIER_EDGES = np.array([80.0, 90.0, 95.0])
+_DISCOUNT_TIER_SCORES = np.array([0.0, 0.20, 0.30, 0.40])
+
+
+def _discount_tiers_numpy(discounts: np.ndarray) -> np.ndarray:
+    """Discount tier per row (0 = below 80% or NaN, 3 = extreme)"""
+    tiers = np.searchsorted(_DISCOUNT_TIER_EDGES, discounts, side='right')
+    # searchsorted sorts NaN past every edge; NaN never reached a tier before
+    tiers[np.isnan(discounts)] = 0
+    return tiers
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _discount_tiers(discounts):
+        """Compiled _discount_tiers_numpy: one comparison chain per row"""
+        tiers = np.zeros(discounts.shape[0], np.int64)
+        for i in range(discounts.shape[0]):
+            x = discounts[i]
+            if x >= 95:
+                tiers[i] = 3
+            elif x >= 90:
+                tiers[i] = 2
+            elif x >= 80:
+                tiers[i] = 1
+        return tiers
+
+    @njit(cache=True)
+    def _zscore_hits(deviations, std, threshold, min_confidence):
+        """Compiled _zscore_hits_numpy"""
+        positions = np.empty(deviations.shape[0], np.int64)
+        z_scores = np.empty(deviations.shape[0], np.float64)
+        hits = 0
+        for i in range(deviations.shape[0]):
+            z = deviations[i] / std
+            if z > threshold and min(abs(z) / 5.0, 1.0) >= min_confidence:
+                positions[hits] = i
+                z_scores[hits] = z
+                hits += 1
+        return positions[:hits], z_scores[:hits]
+
+    @njit(cache=True)
+    def _iqr_hits(discounts, upper_bound, iqr, min_confidence):
+        """Compiled _iqr_hits_numpy"""
+        rows = np.empty(discounts.shape[0], np.int64)
+        confidence = np.empty(discounts.shape[0], np.float64)
+        hits = 0
+        for i in range(discounts.shape[0]):
+            x = discounts[i]
+            if x > upper_bound and x > 0:
+                deviation = (x - upper_bound) / iqr if iqr > 0 else 0.0
+                conf = min(max(0.5 + deviation * 0.2, 0.0), 1.0)
+                if conf >= min_confidence:
+                    rows[hits] = i
+                    confidence[hits] = conf
+                    hits += 1
+        return rows[:hits], confidence[:hits]
+else:
+    _discount_tiers = _discount_tiers_numpy
+    _zscore_hits = _zscore_hits_numpy
+    _iqr_hits = _iqr_hits_numpy
+
+
+def _zscore_outliers(discounts: np.ndarray, threshold: float,
+                     min_confidence: float) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Z-score outliers among the positive discounts
+
+    Returns the row positions of the hits, their z-scores and the mean discount.
+    Fewer than 3 discounted products or zero spread yields no hits. The mean and
+    spread always come from NumPy's two-pass sums so the evidence text does not
+    depend on whether the hit scan is compiled.
+    """
+    with np.errstate(invalid='ignore'):
+        positive = discounts > 0
+    discounted = discounts[positive]
+    if len(discounted) < 3:
+        return np.empty(0, np.int64), np.empty(0), 0.0
+
+    # Sample standard deviation, as pandas computed it. The deviations are
+    # computed once and reused for the variance and the z-scores; the
+    # arithmetic is exactly np.std's, so the results do not change.
+    mean_discount = discounted.mean()
+    deviations = np.subtract(discounted, mean_discount, out=discounted)
+    std_discount = np.sqrt(np.square(deviations).sum() / (len(deviations) - 1))
+    if std_discount == 0:
+        return np.empty(0, np.int64), np.empty(0), mean_discount
+
+    positions, z_scores = _zscore_hits(deviations, std_discount, threshold, min_confidence)
+    return np.flatnonzero(positive)[positions], z_scores, mean_discount
+
+
+def _iqr_outliers(discounts: np.ndarray, multiplier: float,
+                  min_confidence: float) -> Tuple[np.ndarray, np.ndarray, float, float]:
+    """
+    IQR outliers among the positive discounts
+
+    Returns the row positions of the hits, their confidences and the quartiles.
+    Fewer than 4 discounted products yields no hits. The quartiles always come
+    from np.quantile (linear interpolation, same as pandas .quantile) because
+    they are shown in the evidence text.
+    """
+    with np.errstate(invalid='ignore'):
+        discounted = discounts[discounts > 0]
+    if len(discounted) < 4:
+        return np.empty(0, np.int64), np.empty(0), 0.0, 0.0
+
+    q1, q3 = np.quantile(discounted, [0.25, 0.75])
+    iqr = q3 - q1
+    rows, confidence = _iqr_hits(discounts, q3 + multiplier * iqr, iqr, min_confidence)
+    return rows, confidence, q1, q3
+
+
+def _to_hundredths(values: np.ndarray) -> np.ndarray:
+    """
+    Values scaled to rounded integer hundredths
+
+    Non-finite values map to 1, which is never a multiple of the round-number
+    moduli used by the detectors.
+    """
+    finite = np.isfinite(values)
+    return np.where(finite, np.rint(np.where(finite, values, 0) * 100), 1).astype(np.int64)
+
+
+# Recommendation for each confidence band: below 0.6, [0.6, 0.7), ..., 0.9 and up
+_RECOMMENDATION_THRESHOLDS = (0.6, 0.7, 0.8, 0.9)
+_RECOMMENDATIONS = (
+    "ℹ️ NOTICE: Potential bargain but verify authenticity",
+    "⚡ CAUTION: Unusually good deal - Check details before buying",
+    "🔍 SUSPICIOUS: Likely too good to be true - Verify carefully",
+    "⚠️ HIGH RISK: Very suspicious - Investigate thoroughly",
+    "🚨 CRITICAL: Almost certainly an error or scam - Do not purchase",
+)
+
+
 class AnomalyDetector:
     """
     Advanced anomaly detection for identifying unnaturally good deals
@@ -60,333 +279,382 @@ class AnomalyDetector:
             logger.warning("Empty DataFrame provided for anomaly detection")
             return []
 
-        anomalies = []
-
-        # Method 1: Z-score based outlier detection
-        z_score_anomalies = self._detect_zscore_anomalies(products_df)
-        anomalies.extend(z_score_anomalies)
+        # Group on integer category codes rather than hashing strings
+        if 'category' in products_df.columns and (pd.api.types.is_object_dtype(products_df['category'])
+                                                  or pd.api.types.is_string_dtype(products_df['category'])):
+            products_df = products_df.assign(category=products_df['category'].astype('category'))
 
-        # Method 2: IQR-based outlier detection
-        iqr_anomalies = self._detect_iqr_anomalies(products_df)
-        anomalies.extend(iqr_anomalies)
-
-        # Method 3: Fake discount detection
-        fake_discount_anomalies = self._detect_fake_discounts(products_df)
-        anomalies.extend(fake_discount_anomalies)
-
-        # Method 4: Too-good-to-be-true detection
-        tgtbt_anomalies = self._detect_too_good_to_be_true(products_df)
-        anomalies.extend(tgtbt_anomalies)
-
-        # Method 5: Price manipulation detection
-        manipulation_anomalies = self._detect_price_manipulation(products_df)
-        anomalies.extend(manipulation_anomalies)
+        anomalies = self._score_all(products_df)
+        if anomalies.empty:
+            logger.info("Detected 0 anomalies")
+            return []
 
         # Remove duplicates and sort by confidence
         anomalies = self._deduplicate_anomalies(anomalies)
-        anomalies = sorted(anomalies, key=lambda x: x.confidence_score, reverse=True)
 
         logger.info(f"Detected {len(anomalies)} anomalies")
-        return anomalies
+        return _to_results(anomalies)
 
-    def _detect_zscore_anomalies(self, df: pd.DataFrame) -> List[AnomalyResult]:
-        """Detect anomalies using Z-score method"""
-        anomalies = []
+    def _score_all(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Run every detector over one shared read of the product columns
 
-        if 'discount_percentage' not in df.columns:
-            return anomalies
+        Returns all hits as one long-form result frame, in detector order.
+        """
+        columns = _ProductColumns.from_frame(df)
+        available = set(df.columns)
+        n = len(df)
+
+        # Each detector with the columns and minimum row count it needs; the
+        # ones that cannot produce anything are skipped up front
+        detectors = [
+            # Method 1: Z-score based outlier detection
+            (self._detect_zscore_anomalies, {'discount_percentage'}, 3),
+            # Method 2: IQR-based outlier detection
+            (self._detect_iqr_anomalies, {'discount_percentage'}, 4),
+            # Method 3: Fake discount detection
+            (self._detect_fake_discounts, {'current_price', 'original_price', 'discount_percentage', 'category'}, 1),
+            # Method 4: Too-good-to-be-true detection
+            (self._detect_too_good_to_be_true, {'current_price', 'discount_percentage'}, 1),
+            # Method 5: Price manipulation detection
+            (self._detect_price_manipulation, {'current_price', 'original_price', 'discount_percentage'}, 1),
+        ]
+        # Stream detector output straight into concat rather than collecting it first
+        hits = (
+            frame
+            for frame in (detector(df, columns)
+                          for detector, required, min_rows in detectors
+                          if required <= available and n >= min_rows)
+            if not frame.empty
+        )
+        first = next(hits, None)
+        if first is None:
+            return _result_frame(0)
+        return pd.concat(chain((first,), hits), ignore_index=True)
+
+    def _detect_zscore_anomalies(self, df: pd.DataFrame,
+                                 columns: Optional[_ProductColumns] = None) -> pd.DataFrame:
+        """Detect anomalies using Z-score method"""
+        anomalies = _result_frame(0)
+        columns = columns or _ProductColumns.from_frame(df)
 
-        # Filter products with discounts
-        discounted = df[df['discount_percentage'] > 0].copy()
-        if len(discounted) < 3:
+        if columns.discount is None:
             return anomalies
 
-        # Calculate Z-scores
-        mean_discount = discounted['discount_percentage'].mean()
-        std_discount = discounted['discount_percentage'].std()
-
-        if std_discount == 0:
+        # Outliers among the discounted products
+        discounts = columns.discount
+        rows, z_scores, mean_discount = _zscore_outliers(
+            discounts, float(self.z_score_threshold), float(self.min_confidence))
+        if len(rows) == 0:
             return anomalies
 
-        discounted['z_score'] = (discounted['discount_percentage'] - mean_discount) / std_discount
-
-        # Find outliers
-        outliers = discounted[discounted['z_score'] > self.z_score_threshold]
-
-        for _, row in outliers.iterrows():
-            z_score = row['z_score']
-            confidence = min(abs(z_score) / 5.0, 1.0)  # Normalize to 0-1
-
-            if confidence >= self.min_confidence:
-                anomalies.append(AnomalyResult(
-                    product_name=row.get('name', 'Unknown'),
-                    anomaly_type='STATISTICAL_OUTLIER',
-                    confidence_score=float(confidence),
-                    description=f'Discount is {z_score:.2f} standard deviations above mean',
-                    current_price=row.get('current_price'),
-                    original_price=row.get('original_price'),
-                    discount_percentage=row.get('discount_percentage'),
-                    evidence=[
-                        f'Z-score: {z_score:.2f}',
-                        f'Mean discount: {mean_discount:.1f}%',
-                        f'Product discount: {row["discount_percentage"]:.1f}%'
-                    ],
-                    recommendation=self._get_recommendation(confidence)
-                ))
-
-        return anomalies
-
-    def _detect_iqr_anomalies(self, df: pd.DataFrame) -> List[AnomalyResult]:
+        confidence = np.minimum(np.abs(z_scores) / 5.0, 1.0)  # Normalize to 0-1
+        discounted = discounts[rows]
+
+        return _result_frame(
+            len(rows),
+            product_name=columns.names[rows],
+            anomaly_type='STATISTICAL_OUTLIER',
+            confidence_score=confidence,
+            description=[f'Discount is {z_score:.2f} standard deviations above mean' for z_score in z_scores],
+            current_price=columns.at(columns.current, rows),
+            original_price=columns.at(columns.original, rows),
+            discount_percentage=discounted,
+            evidence=[
+                [
+                    f'Z-score: {z_score:.2f}',
+                    f'Mean discount: {mean_discount:.1f}%',
+                    f'Product discount: {discount:.1f}%'
+                ]
+                for z_score, discount in zip(z_scores, discounted)
+            ],
+            recommendation=[self._get_recommendation(conf) for conf in confidence]
+        )
+
+    def _detect_iqr_anomalies(self, df: pd.DataFrame,
+                              columns: Optional[_ProductColumns] = None) -> pd.DataFrame:
         """Detect anomalies using Interquartile Range method"""
-        anomalies = []
+        anomalies = _result_frame(0)
+        columns = columns or _ProductColumns.from_frame(df)
 
-        if 'discount_percentage' not in df.columns:
+        if columns.discount is None:
             return anomalies
 
-        discounted = df[df['discount_percentage'] > 0].copy()
-        if len(discounted) < 4:
+        discounts = columns.discount
+        rows, confidence, Q1, Q3 = _iqr_outliers(
+            discounts, float(self.iqr_multiplier), float(self.min_confidence))
+        if len(rows) == 0:
             return anomalies
 
-        # Calculate IQR
-        Q1 = discounted['discount_percentage'].quantile(0.25)
-        Q3 = discounted['discount_percentage'].quantile(0.75)
+        # Outlier bound, for the evidence text
         IQR = Q3 - Q1
-
-        # Define outlier bounds
         upper_bound = Q3 + self.iqr_multiplier * IQR
-
-        # Find outliers
-        outliers = discounted[discounted['discount_percentage'] > upper_bound]
-
-        for _, row in outliers.iterrows():
-            discount = row['discount_percentage']
-            deviation = (discount - upper_bound) / IQR if IQR > 0 else 0
-            confidence = min(0.5 + deviation * 0.2, 1.0)
-
-            if confidence >= self.min_confidence:
-                anomalies.append(AnomalyResult(
-                    product_name=row.get('name', 'Unknown'),
-                    anomaly_type='IQR_OUTLIER',
-                    confidence_score=float(confidence),
-                    description=f'Discount beyond IQR upper bound',
-                    current_price=row.get('current_price'),
-                    original_price=row.get('original_price'),
-                    discount_percentage=row.get('discount_percentage'),
-                    evidence=[
-                        f'Upper bound: {upper_bound:.1f}%',
-                        f'Product discount: {discount:.1f}%',
-                        f'IQR: {IQR:.1f}'
-                    ],
-                    recommendation=self._get_recommendation(confidence)
-                ))
-
-        return anomalies
-
-    def _detect_fake_discounts(self, df: pd.DataFrame) -> List[AnomalyResult]:
+        discounted = discounts[rows]
+
+        return _result_frame(
+            len(rows),
+            product_name=columns.names[rows],
+            anomaly_type='IQR_OUTLIER',
+            confidence_score=confidence,
+            description='Discount beyond IQR upper bound',
+            current_price=columns.at(columns.current, rows),
+            original_price=columns.at(columns.original, rows),
+            discount_percentage=discounted,
+            evidence=[
+                [
+                    f'Upper bound: {upper_bound:.1f}%',
+                    f'Product discount: {discount:.1f}%',
+                    f'IQR: {IQR:.1f}'
+                ]
+                for discount in discounted
+            ],
+            recommendation=[self._get_recommendation(conf) for conf in confidence]
+        )
+
+    def _detect_fake_discounts(self, df: pd.DataFrame,
+                               columns: Optional[_ProductColumns] = None) -> pd.DataFrame:
         """
         Detect fake discounts where original price may be artificially inflated
         
         This is crucial for identifying deceptive pricing practices
         """
-        anomalies = []
+        anomalies = _result_frame(0)
+        columns = columns or _ProductColumns.from_frame(df)
 
-        for _, row in df.iterrows():
-            current = row.get('current_price')
-            original = row.get('original_price')
-            discount = row.get('discount_percentage', 0)
+        current, original, discount = columns.current, columns.original, columns.discount
+        if df.empty or 'category' not in df.columns or current is None or original is None or discount is None:
+            return anomalies
 
-            if not current or not original or discount == 0:
-                continue
+        cat_median, cat_count = self._category_price_stats(df)
+        has_category = (df['category'] != '').to_numpy()
 
-            suspicion_indicators = []
-            confidence = 0.0
+        # NaN prices are not skipped here (matching the old truthiness check);
+        # every comparison involving NaN is simply False.
+        candidate = (current != 0) & (original != 0) & (discount != 0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Round-number checks on integer hundredths (øre for prices), so a
+            # value like 199.99999999 left over from arithmetic still counts as 200
+            original_cents = _to_hundredths(original)
+            discount_hundredths = _to_hundredths(discount)
 
             # Indicator 1: Original price is a very round number
-            if original >= 100 and original % 100 == 0:
-                suspicion_indicators.append('Original price is suspiciously round')
-                confidence += 0.15
-            elif original >= 50 and original % 50 == 0:
-                suspicion_indicators.append('Original price is a round number')
-                confidence += 0.10
+            round_100 = candidate & (original >= 100) & (original_cents % 10000 == 0)
+            round_50 = candidate & (original >= 50) & (original_cents % 5000 == 0) & ~round_100
 
             # Indicator 2: Discount is also a very round number
-            if discount % 10 == 0 and discount >= 50:
-                suspicion_indicators.append('Discount is a round percentage')
-                confidence += 0.10
+            round_discount = candidate & (discount_hundredths % 1000 == 0) & (discount >= 50)
 
             # Indicator 3: Original price seems way above market range
-            category = row.get('category')
-            if category:
-                cat_prices = df[df['category'] == category]['current_price']
-                if len(cat_prices) > 5:
-                    median_price = cat_prices.median()
-                    if original > median_price * 2.5:
-                        suspicion_indicators.append(f'Original price {original:.2f} is 2.5x category median {median_price:.2f}')
-                        confidence += 0.30
-
-            # Indicator 4: High discount but final price is still average
-            if discount >= 60:
-                category_prices = df[df['category'] == row.get('category')]['current_price']
-                if len(category_prices) > 3:
-                    median_cat_price = category_prices.median()
-                    if abs(current - median_cat_price) / median_cat_price < 0.2:  # Within 20% of median
-                        suspicion_indicators.append('Large discount but price is average for category')
-                        confidence += 0.25
-
-            if confidence >= self.min_confidence:
-                anomalies.append(AnomalyResult(
-                    product_name=row.get('name', 'Unknown'),
-                    anomaly_type='FAKE_DISCOUNT',
-                    confidence_score=min(confidence, 1.0),
-                    description='Possible fake discount - original price may be inflated',
-                    current_price=current,
-                    original_price=original,
-                    discount_percentage=discount,
-                    evidence=suspicion_indicators,
-                    recommendation='⚠️ Verify original price was actually charged before discount'
-                ))
-
-        return anomalies
-
-    def _detect_too_good_to_be_true(self, df: pd.DataFrame) -> List[AnomalyResult]:
+            above_market = candidate & has_category & (cat_count > 5) & (original > cat_median * 2.5)
+
+            # Indicator 4: High discount but final price is still average (within 20% of median)
+            average_after = (candidate & (discount >= 60) & (cat_count > 3)
+                             & (np.abs(current - cat_median) / cat_median < 0.2))
+
+        confidence = (0.15 * round_100 + 0.10 * round_50 + 0.10 * round_discount
+                      + 0.30 * above_market + 0.25 * average_after)
+
+        rows = np.flatnonzero(candidate & (confidence >= self.min_confidence))
+        evidence = []
+        for i in rows:
+            suspicion_indicators = []
+            if round_100[i]:
+                suspicion_indicators.append('Original price is suspiciously round')
+            elif round_50[i]:
+                suspicion_indicators.append('Original price is a round number')
+            if round_discount[i]:
+                suspicion_indicators.append('Discount is a round percentage')
+            if above_market[i]:
+                suspicion_indicators.append(
+                    f'Original price {original[i]:.2f} is 2.5x category median {cat_median[i]:.2f}')
+            if average_after[i]:
+                suspicion_indicators.append('Large discount but price is average for category')
+            evidence.append(suspicion_indicators)
+
+        return _result_frame(
+            len(rows),
+            product_name=columns.names[rows],
+            anomaly_type='FAKE_DISCOUNT',
+            confidence_score=np.minimum(confidence[rows], 1.0),
+            description='Possible fake discount - original price may be inflated',
+            current_price=current[rows],
+            original_price=original[rows],
+            discount_percentage=discount[rows],
+            evidence=evidence,
+            recommendation='⚠️ Verify original price was actually charged before discount'
+        )
+
+    def _category_price_stats(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-row category median price and category size
+
+        Computed in one grouped pass instead of re-filtering the frame for
+        every row. Rows without a category get NaN for both and never match.
+        """
+        category = df['category']
+        stats = self._category_stats_table(df)
+        if isinstance(category.dtype, pd.CategoricalDtype):
+            # Broadcast back through the integer codes. Missing categories have
+            # code -1, which picks the trailing NaN.
+            stats = stats.reindex(category.cat.categories)
+            codes = category.cat.codes.to_numpy()
+            median = np.append(stats['median'].to_numpy(dtype=np.float64), np.nan)
+            count = np.append(stats['size'].to_numpy(dtype=np.float64), np.nan)
+            return median[codes], count[codes]
+
+        return (category.map(stats['median']).to_numpy(dtype=np.float64),
+                category.map(stats['size']).to_numpy(dtype=np.float64))
+
+    def _category_stats_table(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Median price and size per category"""
+        return df.groupby('category', observed=True)['current_price'].agg(['median', 'size'])
+
+    def _detect_too_good_to_be_true(self, df: pd.DataFrame,
+                                    columns: Optional[_ProductColumns] = None) -> pd.DataFrame:
         """
         Detect deals that are TOO GOOD TO BE TRUE
         
         This is the main function for your use case - finding unnaturally good offers
         """
-        anomalies = []
+        anomalies = _result_frame(0)
+        columns = columns or _ProductColumns.from_frame(df)
 
-        for _, row in df.iterrows():
-            current = row.get('current_price')
-            original = row.get('original_price')
-            discount = row.get('discount_percentage', 0)
-            name = row.get('name', 'Unknown')
+        current, discount = columns.current, columns.discount
+        if df.empty or current is None or discount is None:
+            return anomalies
 
-            if not current or discount == 0:
-                continue
+        has_original = columns.original is not None
+        original = columns.original if has_original else np.full(len(df), np.nan)
 
-            tgtbt_score = 0.0
-            evidence = []
+        # NaN prices are not skipped (matching the old truthiness check);
+        # comparisons against NaN are simply False.
+        candidate = (current != 0) & (discount != 0)
+        savings = columns.savings if has_original else np.full(len(df), np.nan)
 
-            # Factor 1: Extreme discount (90%+)
-            if discount >= 95:
-                tgtbt_score += 0.40
-                evidence.append(f'Extreme discount of {discount:.1f}%')
-            elif discount >= 90:
-                tgtbt_score += 0.30
-                evidence.append(f'Very high discount of {discount:.1f}%')
-            elif discount >= 80:
-                tgtbt_score += 0.20
-                evidence.append(f'High discount of {discount:.1f}%')
+        with np.errstate(invalid='ignore'):
+            # Factor 1: Extreme discount (90%+), classified in a single pass
+            tiers = _discount_tiers(discount)
 
             # Factor 2: Large absolute savings
-            if original:
-                savings = original - current
-                if savings > 5000:
-                    tgtbt_score += 0.25
-                    evidence.append(f'Massive savings of {savings:.2f} DKK')
-                elif savings > 2000:
-                    tgtbt_score += 0.15
-                    evidence.append(f'Large savings of {savings:.2f} DKK')
+            massive = savings > 5000
+            large = (savings > 2000) & ~massive
 
             # Factor 3: Premium product at bargain price
-            if 'samsung' in name.lower() or 'apple' in name.lower() or 'sony' in name.lower():
-                if current < 500 and discount > 70:
-                    tgtbt_score += 0.20
-                    evidence.append('Premium brand at suspiciously low price')
+            # Lowercase the names once, as the old per-row name.lower() did, so
+            # casefolding behaves the same as before for non-ASCII names
+            lowered_names = pd.Series(columns.names).astype(str).str.lower()
+            premium = lowered_names.str.contains(_PREMIUM_RE, na=False).to_numpy()
+            premium_bargain = premium & (current < 500) & (discount > 70)
 
             # Factor 4: Current price is extremely low
-            if current < 50 and original and original > 500:
-                tgtbt_score += 0.15
-                evidence.append(f'Price dropped from {original:.2f} to {current:.2f}')
-
-            if tgtbt_score >= self.min_confidence:
-                anomalies.append(AnomalyResult(
-                    product_name=name,
-                    anomaly_type='TOO_GOOD_TO_BE_TRUE',
-                    confidence_score=min(tgtbt_score, 1.0),
-                    description='Deal appears too good to be true - verify authenticity',
-                    current_price=current,
-                    original_price=original,
-                    discount_percentage=discount,
-                    evidence=evidence,
-                    recommendation='🚨 VERIFY: Check seller, product condition, and reviews before purchasing'
-                ))
-
-        return anomalies
-
-    def _detect_price_manipulation(self, df: pd.DataFrame) -> List[AnomalyResult]:
-        """Detect potential price manipulation patterns"""
-        anomalies = []
+            price_dropped = (current < 50) & (original > 500)
 
-        for _, row in df.iterrows():
-            current = row.get('current_price')
-            original = row.get('original_price')
-            discount = row.get('discount_percentage', 0)
+        tgtbt_score = (_DISCOUNT_TIER_SCORES[tiers]
+                       + np.select([massive, large], [0.25, 0.15], 0.0)
+                       + 0.20 * premium_bargain
+                       + 0.15 * price_dropped)
 
-            if not current or not original or discount == 0:
-                continue
-
-            # Check for suspicious price patterns
-            manipulation_score = 0.0
+        rows = np.flatnonzero(candidate & (tgtbt_score >= self.min_confidence))
+        evidence_lists = []
+        for i in rows:
             evidence = []
+            tier = tiers[i]
+            if tier == 3:
+                evidence.append(f'Extreme discount of {discount[i]:.1f}%')
+            elif tier == 2:
+                evidence.append(f'Very high discount of {discount[i]:.1f}%')
+            elif tier == 1:
+                evidence.append(f'High discount of {discount[i]:.1f}%')
+            if massive[i]:
+                evidence.append(f'Massive savings of {savings[i]:.2f} DKK')
+            elif large[i]:
+                evidence.append(f'Large savings of {savings[i]:.2f} DKK')
+            if premium_bargain[i]:
+                evidence.append('Premium brand at suspiciously low price')
+            if price_dropped[i]:
+                evidence.append(f'Price dropped from {original[i]:.2f} to {current[i]:.2f}')
+            evidence_lists.append(evidence)
+
+        return _result_frame(
+            len(rows),
+            product_name=columns.names[rows],
+            anomaly_type='TOO_GOOD_TO_BE_TRUE',
+            confidence_score=np.minimum(tgtbt_score[rows], 1.0),
+            description='Deal appears too good to be true - verify authenticity',
+            current_price=current[rows],
+            original_price=original[rows] if has_original else None,
+            discount_percentage=discount[rows],
+            evidence=evidence_lists,
+            recommendation='🚨 VERIFY: Check seller, product condition, and reviews before purchasing'
+        )
+
+    def _detect_price_manipulation(self, df: pd.DataFrame,
+                                   columns: Optional[_ProductColumns] = None) -> pd.DataFrame:
+        """Detect potential price manipulation patterns"""
+        anomalies = _result_frame(0)
+        columns = columns or _ProductColumns.from_frame(df)
+
+        current, original, discount = columns.current, columns.original, columns.discount
+        if df.empty or current is None or original is None or discount is None:
+            return anomalies
+        candidate = (current != 0) & (original != 0) & (discount != 0)
 
+        with np.errstate(invalid='ignore'):
             # Pattern 1: Original price ends in .99 but "discounted" price ends in .00
-            if original % 1 > 0.98 and current % 1 < 0.05:
-                manipulation_score += 0.15
-                evidence.append('Suspicious price pattern: original .99, sale .00')
+            odd_cents = (original % 1 > 0.98) & (current % 1 < 0.05)
 
             # Pattern 2: Discount percentage is exactly 50%, 75%, etc. (common manipulation)
-            if discount in [50.0, 75.0, 66.7, 33.3]:
-                manipulation_score += 0.10
-                evidence.append(f'Common manipulation discount: {discount}%')
+            common_discount = np.isin(discount, [50.0, 75.0, 66.7, 33.3])
+
+            # Pattern 3: Current price * 2 = original price (doubled for discount).
+            # Kept as a strict < 1 comparison; np.isclose would also add a relative tolerance.
+            doubled = np.abs(current * 2 - original) < 1
 
-            # Pattern 3: Current price * 2 = original price (doubled for discount)
-            if original and abs(current * 2 - original) < 1:
-                manipulation_score += 0.20
+        manipulation_score = 0.15 * odd_cents + 0.10 * common_discount + 0.20 * doubled
+
+        rows = np.flatnonzero(candidate & (manipulation_score >= 0.25))
+        evidence_lists = []
+        for i in rows:
+            evidence = []
+            if odd_cents[i]:
+                evidence.append('Suspicious price pattern: original .99, sale .00')
+            if common_discount[i]:
+                evidence.append(f'Common manipulation discount: {float(discount[i])}%')
+            if doubled[i]:
                 evidence.append('Original price appears to be exactly double current price')
+            evidence_lists.append(evidence)
+
+        return _result_frame(
+            len(rows),
+            product_name=columns.names[rows],
+            anomaly_type='PRICE_MANIPULATION',
+            confidence_score=np.minimum(manipulation_score[rows] + 0.4, 1.0),
+            description='Possible price manipulation detected',
+            current_price=current[rows],
+            original_price=original[rows],
+            discount_percentage=discount[rows],
+            evidence=evidence_lists,
+            recommendation='⚠️ Cross-check prices with other retailers'
+        )
+
+    def _deduplicate_anomalies(self, anomalies: pd.DataFrame) -> pd.DataFrame:
+        """
+        Remove duplicate anomalies for the same product, highest confidence first
 
-            if manipulation_score >= 0.25:
-                anomalies.append(AnomalyResult(
-                    product_name=row.get('name', 'Unknown'),
-                    anomaly_type='PRICE_MANIPULATION',
-                    confidence_score=min(manipulation_score + 0.4, 1.0),
-                    description='Possible price manipulation detected',
-                    current_price=current,
-                    original_price=original,
-                    discount_percentage=discount,
-                    evidence=evidence,
-                    recommendation='⚠️ Cross-check prices with other retailers'
-                ))
-
-        return anomalies
-
-    def _deduplicate_anomalies(self, anomalies: List[AnomalyResult]) -> List[AnomalyResult]:
-        """Remove duplicate anomalies for the same product"""
-        seen_products = {}
-
-        for anomaly in anomalies:
-            if anomaly.product_name not in seen_products:
-                seen_products[anomaly.product_name] = anomaly
-            else:
-                # Keep the one with higher confidence
-                if anomaly.confidence_score > seen_products[anomaly.product_name].confidence_score:
-                    seen_products[anomaly.product_name] = anomaly
-
-        return list(seen_products.values())
+        One stable sort on (confidence desc, first-seen product order) does both
+        jobs: the first row per product is then the one with higher confidence
+        (earliest on ties), and equally confident products keep first-seen order.
+        """
+        # factorize numbers products in order of first appearance
+        product_codes, _ = pd.factorize(anomalies['product_name'], use_na_sentinel=False)
+        order = np.lexsort((product_codes, -anomalies['confidence_score'].to_numpy(dtype=np.float64)))
+        _, first = np.unique(product_codes[order], return_index=True)
+        return anomalies.iloc[order[np.sort(first)]]
 
     def _get_recommendation(self, confidence: float) -> str:
         """Get recommendation based on confidence score"""
-        if confidence >= 0.9:
-            return "🚨 CRITICAL: Almost certainly an error or scam - Do not purchase"
-        elif confidence >= 0.8:
-            return "⚠️ HIGH RISK: Very suspicious - Investigate thoroughly"
-        elif confidence >= 0.7:
-            return "🔍 SUSPICIOUS: Likely too good to be true - Verify carefully"
-        elif confidence >= 0.6:
-            return "⚡ CAUTION: Unusually good deal - Check details before buying"
-        else:
-            return "ℹ️ NOTICE: Potential bargain but verify authenticity"
+        return _RECOMMENDATIONS[bisect_right(_RECOMMENDATION_THRESHOLDS, confidence)]
 
 
 def detect_suspicious_deals(products_df: pd.DataFrame, config: Optional[Dict] = None) -> List[AnomalyResult]:
@@ -9,10 +9,239 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
+from ._columns import float_column, take, truthy
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the NumPy scoring kernel is used instead
+    njit = None
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _no_results(df: pd.DataFrame) -> List[Dict]:
+    """Stand-in for a scan that cannot find anything"""
+    return []
+
+
+# Discount distribution buckets, split at the inner edges (a value on an edge
+# goes to the upper bucket)
+_DISCOUNT_BIN_EDGES = np.array([10, 25, 50, 75, 90], dtype=np.float64)
+_DISCOUNT_BIN_LABELS = ('0-10%', '10-25%', '25-50%', '50-75%', '75-90%', '90%+')
+
+
+# Below this many rows, category statistics skip the pandas groupby machinery.
+# Covers the dashboard (500) and CLI (5000) loads; the NumPy path loops over
+# categories, so it is kept away from huge frames with many categories.
+_SMALL_FRAME_ROWS = 10_000
+
+
+def _category_codes(category: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Categorical codes (-1 for missing) and the categories they index"""
+    if not isinstance(category.dtype, pd.CategoricalDtype):
+        category = category.astype('category')
+    return category.cat.codes.to_numpy(), category.cat.categories
+
+
+def _category_benchmarks(df: pd.DataFrame, category_stats: Dict) -> Dict[str, np.ndarray]:
+    """Broadcast per-category statistics to one float64 array per statistic
+
+    The statistics are laid out per category and gathered through the
+    categorical codes. Rows whose category has no statistics get NaN.
+    """
+    columns = ['mean_discount', 'std_discount', 'median_price', 'percentile_90']
+    if 'category' not in df.columns or not category_stats:
+        return {column: np.full(len(df), np.nan) for column in columns}
+
+    codes, categories = _category_codes(df['category'])
+    stats = pd.DataFrame.from_dict(category_stats, orient='index', dtype=np.float64)
+    stats = stats.reindex(categories)
+
+    # Code -1 (missing category) picks the trailing NaN
+    return {column: np.append(stats[column].to_numpy(), np.nan)[codes] for column in columns}
+
+
+def _category_statistics_numpy(category: pd.Series, discounts: np.ndarray,
+                               prices: np.ndarray) -> Dict:
+    """
+    Per-category benchmarks from one NumPy slice per category
+
+    For small frames this beats the fixed cost of a pandas groupby. The
+    statistics are computed as the Series methods compute them, so they
+    match the groupby path. ``discounts`` and ``prices`` hold NaN where a
+    value does not count.
+    """
+    codes, categories = _category_codes(category)
+    order = np.argsort(codes, kind='stable')
+    groups = np.split(order, np.flatnonzero(np.diff(codes[order])) + 1)
+    # First-appearance order, like groupby(sort=False)
+    groups.sort(key=lambda rows: rows[0])
+
+    stats = {}
+    for rows in groups:
+        code = codes[rows[0]]
+        if code < 0:
+            continue
+        group_discounts = discounts[rows][~np.isnan(discounts[rows])]
+        group_prices = prices[rows][~np.isnan(prices[rows])]
+        has_prices = len(group_prices) > 0
+        stats[categories[code]] = {
+            'mean_discount': float(group_discounts.mean()) if len(group_discounts) > 0 else 0.0,
+            'std_discount': float(group_discounts.std(ddof=1)) if len(group_discounts) > 1 else 0.0,
+            'median_price': float(np.median(group_prices)) if has_prices else 0.0,
+            'mean_price': float(group_prices.mean()) if has_prices else 0.0,
+            'percentile_90': float(np.quantile(group_prices, 0.9)) if has_prices else 0.0,
+            'product_count': len(rows),
+        }
+    return stats
+
+
+def _deal_quality_scores(current: np.ndarray, original: np.ndarray,
+                         discount: np.ndarray, mean_discount: np.ndarray) -> np.ndarray:
+    """
+    Vectorized "Deal Quality Score" (0-100) for aligned float64 arrays
+
+    ``mean_discount`` is the category's mean discount, NaN for products
+    without category statistics.
+    """
+    # Factor 1: Discount percentage (0-40 points)
+    score = np.minimum(discount / 2, 40)  # Max 40 points for 80%+ discount
+
+    # Factor 2: Absolute savings (0-30 points)
+    savings = original - current
+    score += np.select([savings > 1000, savings > 500, savings > 200], [30, 20, 10], 0)
+
+    # Factor 3: Relative to category (0-30 points)
+    has_mean = mean_discount > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative_quality = (discount - mean_discount) / mean_discount
+    score += np.where(has_mean, np.minimum(relative_quality * 10, 30), 0)
+
+    return np.minimum(score, 100)
+
+
+# Suspicious deal checks that fired for a product, as bit flags
+_OUTLIER = 1
+_HIGH_DISCOUNT = 2
+_VERY_HIGH_DISCOUNT = 4
+_EXTREME_DISCOUNT = 8
+_UNDERPRICED = 16
+_ROUND_PRICE = 32
+_INFLATED = 64
+_EXCEPTIONAL_QUALITY = 128
+
+
+def _score_deals_numpy(current: np.ndarray, original: np.ndarray, discount: np.ndarray,
+                       mean_discount: np.ndarray, std_discount: np.ndarray,
+                       median_price: np.ndarray,
+                       percentile_90: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Suspicion scores, deal quality scores and check flags for aligned float64 arrays
+
+    Products without category statistics have NaN benchmarks, so the
+    category checks come out False for them.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_score = (discount - mean_discount) / std_discount
+        deal_quality = _deal_quality_scores(current, original, discount, mean_discount)
+
+        checks = (
+            # Check 1: Statistical outlier in discount (more than 2.5 standard deviations)
+            (_OUTLIER, 30, (std_discount > 0) & (z_score > 2.5)),
+            # Check 2: Extreme discount percentage
+            (_EXTREME_DISCOUNT, 40, discount >= 90),
+            (_VERY_HIGH_DISCOUNT, 30, (discount >= 80) & (discount < 90)),
+            (_HIGH_DISCOUNT, 20, (discount >= 70) & (discount < 80)),
+            # Check 3: Price too low for category (less than 20% of median)
+            (_UNDERPRICED, 25, (median_price > 0) & (current < median_price * 0.2)),
+            # Check 4: Round number original price (fake discount indicator); every
+            # multiple of 100 is a multiple of 50, so one exact float mod suffices
+            (_ROUND_PRICE, 10, np.mod(original, 50) == 0),
+            # Check 5: Original price seems inflated
+            (_INFLATED, 20, original > percentile_90 * 1.5),
+            # Check 6: Exceptional deal quality
+            (_EXCEPTIONAL_QUALITY, 15, deal_quality > 85),
+        )
+
+    score = np.zeros(len(discount), dtype=np.int64)
+    flags = np.zeros(len(discount), dtype=np.int64)
+    for flag, points, fired in checks:
+        score[fired] += points
+        flags[fired] |= flag
+    return score, deal_quality, flags
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _score_deals(current, original, discount, mean_discount, std_discount,
+                     median_price, percentile_90):
+        """Compiled _score_deals_numpy: one pass per product, no temporaries"""
+        n = discount.shape[0]
+        score = np.zeros(n, np.int64)
+        deal_quality = np.empty(n, np.float64)
+        flags = np.zeros(n, np.int64)
+        for i in prange(n):
+            cur = current[i]
+            orig = original[i]
+            disc = discount[i]
+            mean = mean_discount[i]
+
+            # Comparisons are written so NaN propagates like np.minimum
+            quality = disc / 2
+            if quality > 40:
+                quality = 40.0
+            savings = orig - cur
+            if savings > 1000:
+                quality += 30
+            elif savings > 500:
+                quality += 20
+            elif savings > 200:
+                quality += 10
+            if mean > 0:
+                relative = (disc - mean) / mean * 10
+                if relative > 30:
+                    relative = 30.0
+                quality += relative
+            if quality > 100:
+                quality = 100.0
+            deal_quality[i] = quality
+
+            points = 0
+            fired = 0
+            std = std_discount[i]
+            if std > 0 and (disc - mean) / std > 2.5:
+                points += 30
+                fired |= _OUTLIER
+            if disc >= 90:
+                points += 40
+                fired |= _EXTREME_DISCOUNT
+            elif disc >= 80:
+                points += 30
+                fired |= _VERY_HIGH_DISCOUNT
+            elif disc >= 70:
+                points += 20
+                fired |= _HIGH_DISCOUNT
+            median = median_price[i]
+            if median > 0 and cur < median * 0.2:
+                points += 25
+                fired |= _UNDERPRICED
+            if np.mod(orig, 50) == 0:
+                points += 10
+                fired |= _ROUND_PRICE
+            if orig > percentile_90[i] * 1.5:
+                points += 20
+                fired |= _INFLATED
+            if quality > 85:
+                points += 15
+                fired |= _EXCEPTIONAL_QUALITY
+            score[i] = points
+            flags[i] = fired
+        return score, deal_quality, flags
+else:
+    _score_deals = _score_deals_numpy
+
+
+@dataclass(slots=True, frozen=True)
 class DiscountAnalysis:
     """Results from discount analysis"""
     total_products: int
@@ -66,24 +295,32 @@ class DiscountAnalyzer:
 
         # Basic statistics
         total_products = len(products_df)
-        products_with_discount = len(products_df[products_df['discount_percentage'] > 0])
-
-        discounts = products_df[products_df['discount_percentage'] > 0]['discount_percentage']
-        avg_discount = float(discounts.mean()) if len(discounts) > 0 else 0.0
-        median_discount = float(discounts.median()) if len(discounts) > 0 else 0.0
-        max_discount = float(discounts.max()) if len(discounts) > 0 else 0.0
-
-        # Identify high discount products
-        high_discount_products = self._find_high_discount_products(products_df)
-
-        # Detect potential errors
-        potential_errors = self._detect_pricing_errors(products_df)
-
-        # Detect suspicious deals (UNNATURALLY GOOD)
-        suspicious_deals = self._detect_suspicious_deals(products_df)
+        discounts = products_df['discount_percentage']
+        discounts = discounts[discounts > 0]
+        products_with_discount = len(discounts)
+
+        avg_discount = median_discount = max_discount = 0.0
+        if products_with_discount > 0:
+            summary = discounts.agg(['mean', 'median', 'max'])
+            avg_discount, median_discount, max_discount = (float(value) for value in summary)
+
+        # Non-sale pages (every discount exactly zero) cannot hold high-discount or
+        # suspicious deals, so those scans are skipped; pricing errors still apply
+        on_sale = bool((float_column(products_df, 'discount_percentage') != 0).any())
+        scans = (
+            # Identify high discount products
+            self._find_high_discount_products if on_sale or self.high_discount_threshold <= 0 else _no_results,
+            # Detect potential errors
+            self._detect_pricing_errors,
+            # Detect suspicious deals (UNNATURALLY GOOD)
+            self._detect_suspicious_deals if on_sale else _no_results,
+            # Discount distribution
+            self._calculate_discount_distribution,
+        )
 
-        # Discount distribution
-        discount_distribution = self._calculate_discount_distribution(products_df)
+        high_discount_products, potential_errors, suspicious_deals, discount_distribution = (
+            scan(products_df) for scan in scans
+        )
 
         analysis = DiscountAnalysis(
             total_products=total_products,
@@ -102,78 +339,118 @@ class DiscountAnalyzer:
 
     def _find_high_discount_products(self, df: pd.DataFrame) -> List[Dict]:
         """Find products with unusually high discounts"""
-        high_discount_df = df[df['discount_percentage'] >= self.high_discount_threshold].copy()
-
-        products = []
-        for _, row in high_discount_df.iterrows():
-            products.append({
-                'name': row.get('name', 'Unknown'),
-                'current_price': row.get('current_price'),
-                'original_price': row.get('original_price'),
-                'discount_percentage': row.get('discount_percentage'),
-                'category': row.get('category'),
-                'reason': f"Discount exceeds {self.high_discount_threshold}%"
-            })
-
-        return sorted(products, key=lambda x: x['discount_percentage'], reverse=True)
+        discounts = float_column(df, 'discount_percentage')
+        rows = np.flatnonzero(discounts >= self.high_discount_threshold)
+        rows = rows[np.argsort(-discounts[rows], kind='stable')]
+
+        reason = f"Discount exceeds {self.high_discount_threshold}%"
+        return [
+            {
+                'name': name,
+                'current_price': current,
+                'original_price': original,
+                'discount_percentage': discount,
+                'category': category,
+                'reason': reason
+            }
+            for name, current, original, discount, category in zip(
+                take(df, 'name', rows, 'Unknown'),
+                take(df, 'current_price', rows),
+                take(df, 'original_price', rows),
+                take(df, 'discount_percentage', rows),
+                take(df, 'category', rows),
+            )
+        ]
 
     def _detect_pricing_errors(self, df: pd.DataFrame) -> List[Dict]:
         """Detect potential pricing errors"""
-        errors = []
+        current = float_column(df, 'current_price')
+        original = float_column(df, 'original_price')
+        discount = float_column(df, 'discount_percentage')
 
-        for idx, row in df.iterrows():
-            current = row.get('current_price')
-            original = row.get('original_price')
-            discount = row.get('discount_percentage')
-            name = row.get('name', 'Unknown')
+        # Missing (None) and zero values were skipped by the old truthiness checks
+        has_current = current != 0
+        has_original = original != 0
+        has_discount = discount != 0
 
+        with np.errstate(divide='ignore', invalid='ignore'):
+            calculated = (original - current) / original * 100
+
+        masks = (
             # Error 1: Current price higher than original
-            if current and original and current > original:
+            ('PRICE_INVERSION', has_current & has_original & (current > original)),
+            # Error 2: Negative prices
+            ('NEGATIVE_PRICE', current < 0),
+            # Error 3: Extreme discounts (>95%)
+            ('EXTREME_DISCOUNT', discount > 95),
+            # Error 4: Discount calculation mismatch (5% tolerance)
+            ('DISCOUNT_MISMATCH', has_current & has_discount & (original > 0)
+             & (np.abs(calculated - discount) > 5)),
+        )
+
+        # Most severe first; within a severity keep row order, then check order
+        rows, checks = [], []
+        for check, (_, mask) in enumerate(masks):
+            hits = np.flatnonzero(mask)
+            rows.append(hits)
+            checks.append(np.full(len(hits), check))
+        rows = np.concatenate(rows)
+        checks = np.concatenate(checks)
+        severity = np.array([2, 3, 2, 1])[checks]
+        order = np.lexsort((checks, rows, -severity))
+
+        rows, checks = rows[order], checks[order]
+        flagged = zip(
+            take(df, 'name', rows, 'Unknown'),
+            take(df, 'current_price', rows),
+            take(df, 'original_price', rows),
+            take(df, 'discount_percentage', rows),
+            calculated[rows].tolist(),
+            checks.tolist(),
+        )
+
+        errors = []
+        for name, cur, orig, disc, calculated_discount, check in flagged:
+            error_type = masks[check][0]
+
+            if error_type == 'PRICE_INVERSION':
                 errors.append({
                     'name': name,
-                    'type': 'PRICE_INVERSION',
+                    'type': error_type,
                     'severity': 'HIGH',
-                    'description': f"Current price ({current:.2f}) > Original price ({original:.2f})",
-                    'current_price': current,
-                    'original_price': original
+                    'description': f"Current price ({cur:.2f}) > Original price ({orig:.2f})",
+                    'current_price': cur,
+                    'original_price': orig
                 })
-
-            # Error 2: Negative prices
-            if current and current < 0:
+            elif error_type == 'NEGATIVE_PRICE':
                 errors.append({
                     'name': name,
-                    'type': 'NEGATIVE_PRICE',
+                    'type': error_type,
                     'severity': 'CRITICAL',
-                    'description': f"Negative current price: {current:.2f}",
-                    'current_price': current
+                    'description': f"Negative current price: {cur:.2f}",
+                    'current_price': cur
                 })
-
-            # Error 3: Extreme discounts (>95%)
-            if discount and discount > 95:
+            elif error_type == 'EXTREME_DISCOUNT':
                 errors.append({
                     'name': name,
-                    'type': 'EXTREME_DISCOUNT',
+                    'type': error_type,
                     'severity': 'HIGH',
-                    'description': f"Suspiciously high discount: {discount:.1f}%",
-                    'discount_percentage': discount,
-                    'current_price': current,
-                    'original_price': original
+                    'description': f"Suspiciously high discount: {disc:.1f}%",
+                    'discount_percentage': disc,
+                    'current_price': cur,
+                    'original_price': orig
+                })
+            else:
+                errors.append({
+                    'name': name,
+                    'type': error_type,
+                    'severity': 'MEDIUM',
+                    'description': f"Claimed discount ({disc:.1f}%) != Calculated ({calculated_discount:.1f}%)",
+                    'claimed_discount': disc,
+                    'calculated_discount': calculated_discount
                 })
 
-            # Error 4: Discount calculation mismatch
-            if current and original and discount and original > 0:
-                calculated_discount = ((original - current) / original) * 100
-                if abs(calculated_discount - discount) > 5:  # 5% tolerance
-                    errors.append({
-                        'name': name,
-                        'type': 'DISCOUNT_MISMATCH',
-                        'severity': 'MEDIUM',
-                        'description': f"Claimed discount ({discount:.1f}%) != Calculated ({calculated_discount:.1f}%)",
-                        'claimed_discount': discount,
-                        'calculated_discount': calculated_discount
-                    })
-
-        return sorted(errors, key=lambda x: {'CRITICAL': 3, 'HIGH': 2, 'MEDIUM': 1, 'LOW': 0}.get(x['severity'], 0), reverse=True)
+        return errors
 
     def _detect_suspicious_deals(self, df: pd.DataFrame) -> List[Dict]:
         """
@@ -181,153 +458,123 @@ class DiscountAnalyzer:
         
         This is the core function for your use case - identifying deals that are too good to be true
         """
-        suspicious = []
-
         # Calculate statistics by category
         category_stats = self._calculate_category_statistics(df)
+        benchmarks = _category_benchmarks(df, category_stats)
+        mean_discount = benchmarks['mean_discount']
+        std_discount = benchmarks['std_discount']
+        median_price = benchmarks['median_price']
+        percentile_90 = benchmarks['percentile_90']
+
+        current = float_column(df, 'current_price')
+        original = float_column(df, 'original_price')
+        discount = float_column(df, 'discount_percentage')
+        candidates = truthy(df, 'current_price') & truthy(df, 'original_price') & (discount != 0)
+
+        suspicion_score, deal_quality, checks = _score_deals(
+            current, original, discount, mean_discount, std_discount, median_price, percentile_90
+        )
 
-        for idx, row in df.iterrows():
-            name = row.get('name', 'Unknown')
-            current = row.get('current_price')
-            original = row.get('original_price')
-            discount = row.get('discount_percentage', 0)
-            category = row.get('category', 'unknown')
-
-            if not current or not original or discount == 0:
-                continue
+        # If suspicion score is high enough (>= 40), flag as suspicious,
+        # sorted by suspicion score (highest first)
+        rows = np.flatnonzero(candidates & (suspicion_score >= 40))
+        rows = rows[np.argsort(-suspicion_score[rows], kind='stable')]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_score = (discount[rows] - mean_discount[rows]) / std_discount[rows]
+
+        flagged = zip(
+            take(df, 'name', rows, 'Unknown'),
+            take(df, 'current_price', rows),
+            take(df, 'original_price', rows),
+            take(df, 'discount_percentage', rows, 0),
+            take(df, 'category', rows, 'unknown'),
+            suspicion_score[rows].tolist(),
+            deal_quality[rows].tolist(),
+            checks[rows].tolist(),
+            z_score.tolist(),
+            median_price[rows].tolist(),
+            percentile_90[rows].tolist(),
+        )
 
-            suspicion_score = 0
+        suspicious = []
+        for name, cur, orig, disc, category, score, quality, fired, z, median, p90 in flagged:
             reasons = []
-
-            # Check 1: Statistical outlier in discount
-            if category in category_stats:
-                mean_discount = category_stats[category]['mean_discount']
-                std_discount = category_stats[category]['std_discount']
-
-                if std_discount > 0:
-                    z_score = (discount - mean_discount) / std_discount
-                    if z_score > 2.5:  # More than 2.5 standard deviations
-                        suspicion_score += 30
-                        reasons.append(f"Discount is {z_score:.1f}σ above category average")
-
-            # Check 2: Extreme discount percentage
-            if discount >= 90:
-                suspicion_score += 40
-                reasons.append(f"Extreme discount: {discount:.1f}%")
-            elif discount >= 80:
-                suspicion_score += 30
-                reasons.append(f"Very high discount: {discount:.1f}%")
-            elif discount >= 70:
-                suspicion_score += 20
-                reasons.append(f"High discount: {discount:.1f}%")
-
-            # Check 3: Price too low for category
-            if category in category_stats:
-                median_price = category_stats[category]['median_price']
-                if median_price > 0 and current < median_price * 0.2:  # Less than 20% of median
-                    suspicion_score += 25
-                    reasons.append(f"Price significantly below category median ({current:.2f} vs {median_price:.2f})")
-
-            # Check 4: Round number original price (fake discount indicator)
-            if original % 100 == 0 or original % 50 == 0:  # Suspiciously round numbers
-                suspicion_score += 10
-                reasons.append(f"Suspiciously round original price: {original:.2f}")
-
-            # Check 5: Original price seems inflated
-            if category in category_stats:
-                max_reasonable_price = category_stats[category]['percentile_90']
-                if original > max_reasonable_price * 1.5:
-                    suspicion_score += 20
-                    reasons.append(f"Original price may be inflated ({original:.2f} vs 90th percentile {max_reasonable_price:.2f})")
-
-            # Check 6: Deal scoring - calculate "Deal Quality Score"
-            deal_quality = self._calculate_deal_quality(current, original, discount, category_stats.get(category, {}))
-            if deal_quality > 85:
-                suspicion_score += 15
-                reasons.append(f"Exceptional deal quality score: {deal_quality:.0f}/100")
-
-            # If suspicion score is high enough, flag as suspicious
-            if suspicion_score >= 40:  # Threshold for suspicious deals
-                suspicious.append({
-                    'name': name,
-                    'current_price': current,
-                    'original_price': original,
-                    'discount_percentage': discount,
-                    'category': category,
-                    'suspicion_score': suspicion_score,
-                    'deal_quality': deal_quality,
-                    'reasons': reasons,
-                    'recommendation': self._get_recommendation(suspicion_score)
-                })
-
-        # Sort by suspicion score (highest first)
-        suspicious = sorted(suspicious, key=lambda x: x['suspicion_score'], reverse=True)
+            if fired & _OUTLIER:
+                reasons.append(f"Discount is {z:.1f}σ above category average")
+            if fired & _EXTREME_DISCOUNT:
+                reasons.append(f"Extreme discount: {disc:.1f}%")
+            elif fired & _VERY_HIGH_DISCOUNT:
+                reasons.append(f"Very high discount: {disc:.1f}%")
+            elif fired & _HIGH_DISCOUNT:
+                reasons.append(f"High discount: {disc:.1f}%")
+            if fired & _UNDERPRICED:
+                reasons.append(f"Price significantly below category median ({cur:.2f} vs {median:.2f})")
+            if fired & _ROUND_PRICE:
+                reasons.append(f"Suspiciously round original price: {orig:.2f}")
+            if fired & _INFLATED:
+                reasons.append(f"Original price may be inflated ({orig:.2f} vs 90th percentile {p90:.2f})")
+            if fired & _EXCEPTIONAL_QUALITY:
+                reasons.append(f"Exceptional deal quality score: {quality:.0f}/100")
+
+            suspicious.append({
+                'name': name,
+                'current_price': cur,
+                'original_price': orig,
+                'discount_percentage': disc,
+                'category': category,
+                'suspicion_score': score,
+                'deal_quality': quality,
+                'reasons': reasons,
+                'recommendation': self._get_recommendation(score)
+            })
 
         return suspicious
 
     def _calculate_category_statistics(self, df: pd.DataFrame) -> Dict:
         """Calculate statistical benchmarks for each category"""
-        stats = {}
-
         if 'category' not in df.columns:
-            return stats
-
-        for category in df['category'].unique():
-            if pd.isna(category):
-                continue
-
-            cat_df = df[df['category'] == category].copy()
-
-            # Discount statistics
-            discounts = cat_df[cat_df['discount_percentage'] > 0]['discount_percentage']
-            mean_discount = float(discounts.mean()) if len(discounts) > 0 else 0.0
-            std_discount = float(discounts.std()) if len(discounts) > 1 else 0.0
-
-            # Price statistics
-            prices = cat_df[cat_df['current_price'] > 0]['current_price']
-            median_price = float(prices.median()) if len(prices) > 0 else 0.0
-            mean_price = float(prices.mean()) if len(prices) > 0 else 0.0
-            percentile_90 = float(prices.quantile(0.9)) if len(prices) > 0 else 0.0
-
-            stats[category] = {
-                'mean_discount': mean_discount,
-                'std_discount': std_discount,
-                'median_price': median_price,
-                'mean_price': mean_price,
-                'percentile_90': percentile_90,
-                'product_count': len(cat_df)
-            }
-
-        return stats
+            return {}
+
+        # Only positive discounts and prices count towards the benchmarks
+        discounts = float_column(df, 'discount_percentage')
+        prices = float_column(df, 'current_price')
+        discounts = np.where(discounts > 0, discounts, np.nan)
+        prices = np.where(prices > 0, prices, np.nan)
+
+        if len(df) < _SMALL_FRAME_ROWS:
+            return _category_statistics_numpy(df['category'], discounts, prices)
+
+        values = pd.DataFrame({'discount': discounts, 'price': prices})
+        grouped = values.groupby(df['category'].array, sort=False, observed=True)
+        # GroupBy.quantile interpolates differently from Series.quantile in the last
+        # bit, which can move the 90th percentile shown in the reasons by a cent
+        stats = pd.DataFrame({
+            'mean_discount': grouped['discount'].mean(),
+            'std_discount': grouped['discount'].std(),
+            'median_price': grouped['price'].median(),
+            'mean_price': grouped['price'].mean(),
+            'percentile_90': grouped['price'].agg(lambda prices: prices.quantile(0.9)),
+        }).fillna(0.0)
+        stats['product_count'] = grouped.size()
+
+        return stats.to_dict('index')
 
     def _calculate_deal_quality(self, current_price: float, original_price: float,
                                 discount: float, category_stats: Dict) -> float:
         """
-        Calculate a "Deal Quality Score" from 0-100
+        Calculate a "Deal Quality Score" from 0-100 for a single product
         Higher scores = better deals (potentially unnaturally good)
         """
-        score = 0.0
-
-        # Factor 1: Discount percentage (0-40 points)
-        score += min(discount / 2, 40)  # Max 40 points for 80%+ discount
-
-        # Factor 2: Absolute savings (0-30 points)
-        savings = original_price - current_price
-        if savings > 1000:
-            score += 30
-        elif savings > 500:
-            score += 20
-        elif savings > 200:
-            score += 10
-
-        # Factor 3: Relative to category (0-30 points)
-        if category_stats:
-            mean_discount = category_stats.get('mean_discount', 0)
-            if mean_discount > 0:
-                relative_quality = (discount - mean_discount) / mean_discount
-                score += min(relative_quality * 10, 30)
+        mean_discount = category_stats.get('mean_discount', 0) if category_stats else 0
+        scores = self._deal_quality_scores(
+            np.array([current_price], dtype=np.float64),
+            np.array([original_price], dtype=np.float64),
+            np.array([discount], dtype=np.float64),
+            np.array([mean_discount], dtype=np.float64),
+        )
+        return float(scores[0])
 
-        return min(score, 100)
+    _deal_quality_scores = staticmethod(_deal_quality_scores)
 
     def _get_recommendation(self, suspicion_score: int) -> str:
         """Get recommendation based on suspicion score"""
@@ -342,32 +589,11 @@ class DiscountAnalyzer:
 
     def _calculate_discount_distribution(self, df: pd.DataFrame) -> Dict[str, int]:
         """Calculate distribution of discounts by range"""
-        distribution = {
-            '0-10%': 0,
-            '10-25%': 0,
-            '25-50%': 0,
-            '50-75%': 0,
-            '75-90%': 0,
-            '90%+': 0
-        }
-
-        discounts = df[df['discount_percentage'] > 0]['discount_percentage']
-
-        for discount in discounts:
-            if discount < 10:
-                distribution['0-10%'] += 1
-            elif discount < 25:
-                distribution['10-25%'] += 1
-            elif discount < 50:
-                distribution['25-50%'] += 1
-            elif discount < 75:
-                distribution['50-75%'] += 1
-            elif discount < 90:
-                distribution['75-90%'] += 1
-            else:
-                distribution['90%+'] += 1
+        discounts = float_column(df, 'discount_percentage')
+        buckets = np.searchsorted(_DISCOUNT_BIN_EDGES, discounts[discounts > 0], side='right')
+        counts = np.bincount(buckets, minlength=len(_DISCOUNT_BIN_LABELS))
 
-        return distribution
+        return dict(zip(_DISCOUNT_BIN_LABELS, counts.tolist()))
 
     def _empty_analysis(self) -> DiscountAnalysis:
         """Return empty analysis result"""
@@ -4,10 +4,12 @@ Price Validator for detecting pricing anomalies and errors
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
+from ._columns import float_column, take, truthy
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,17 +47,7 @@ class PriceValidator:
             return self._empty_report()
 
         total_products = len(products_df)
-        errors = []
-        warnings = []
-
-        for idx, row in products_df.iterrows():
-            product_errors = self._validate_product(row)
-            if product_errors:
-                for error in product_errors:
-                    if error['severity'] in ['CRITICAL', 'HIGH']:
-                        errors.append(error)
-                    else:
-                        warnings.append(error)
+        errors, warnings = self._validate_products(products_df)
 
         invalid_products = len(set(e['name'] for e in errors))
         valid_products = total_products - invalid_products
@@ -73,96 +65,138 @@ class PriceValidator:
         logger.info(f"Validation complete: {valid_products}/{total_products} valid products")
         return report
 
-    def _validate_product(self, row: pd.Series) -> List[Dict]:
-        """Validate a single product"""
+    def _validate_products(self, df: pd.DataFrame) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Validate all products at once
+
+        Each validation is a mask over the whole frame; dicts are only built
+        for the flagged products. Returns (errors, warnings) in product order,
+        and in validation order within a product.
+        """
+        current = float_column(df, 'current_price')
+        original = float_column(df, 'original_price')
+        discount = float_column(df, 'discount_percentage')
+        has_name = truthy(df, 'name', 'Unknown')
+        has_current = truthy(df, 'current_price')
+        has_prices = has_current & truthy(df, 'original_price')
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            calculated = np.where(original > 0, (original - current) / original * 100, 0.0)
+
+        masks = (
+            # Validation 1: Missing data
+            ('MISSING_DATA', ~has_name | ~has_current),
+            # Validation 2: Price range
+            ('PRICE_TOO_LOW', current < self.min_price),
+            ('PRICE_TOO_HIGH', ~(current < self.min_price) & (current > self.max_price)),
+            # Validation 3: Negative prices
+            ('NEGATIVE_PRICE', current < 0),
+            # Validation 4: Price inversion
+            ('PRICE_INVERSION', has_prices & (current > original)),
+            # Validation 5: Discount range
+            ('NEGATIVE_DISCOUNT', discount < 0),
+            ('EXCESSIVE_DISCOUNT', ~(discount < 0) & (discount > self.max_discount)),
+            # Validation 6: Discount calculation (5% tolerance)
+            ('DISCOUNT_CALCULATION_ERROR', has_prices & truthy(df, 'discount_percentage')
+             & (np.abs(calculated - discount) > 5)),
+        )
+
+        rows, checks = [], []
+        for check, (_, mask) in enumerate(masks):
+            hits = np.flatnonzero(mask)
+            rows.append(hits)
+            checks.append(np.full(len(hits), check))
+        rows = np.concatenate(rows)
+        checks = np.concatenate(checks)
+        order = np.lexsort((checks, rows))
+        rows, checks = rows[order], checks[order]
+
+        flagged = zip(
+            take(df, 'name', rows, 'Unknown'),
+            take(df, 'current_price', rows),
+            take(df, 'original_price', rows),
+            take(df, 'discount_percentage', rows),
+            calculated[rows].tolist(),
+            checks.tolist(),
+        )
+
         errors = []
-        name = row.get('name', 'Unknown')
-        current = row.get('current_price')
-        original = row.get('original_price')
-        discount = row.get('discount_percentage')
-
-        # Validation 1: Missing data
-        if not name or not current:
-            errors.append({
-                'name': name,
-                'type': 'MISSING_DATA',
-                'severity': 'HIGH',
-                'description': 'Missing required product data (name or price)'
-            })
-
-        # Validation 2: Price range
-        if current is not None:
-            if current < self.min_price:
-                errors.append({
+        warnings = []
+        for name, current, original, discount, calculated_discount, check in flagged:
+            error_type = masks[check][0]
+
+            if error_type == 'MISSING_DATA':
+                error = {
                     'name': name,
-                    'type': 'PRICE_TOO_LOW',
+                    'type': error_type,
+                    'severity': 'HIGH',
+                    'description': 'Missing required product data (name or price)'
+                }
+            elif error_type == 'PRICE_TOO_LOW':
+                error = {
+                    'name': name,
+                    'type': error_type,
                     'severity': 'HIGH',
                     'description': f'Price {current:.2f} below minimum {self.min_price}',
                     'current_price': current
-                })
-            elif current > self.max_price:
-                errors.append({
+                }
+            elif error_type == 'PRICE_TOO_HIGH':
+                error = {
                     'name': name,
-                    'type': 'PRICE_TOO_HIGH',
+                    'type': error_type,
                     'severity': 'MEDIUM',
                     'description': f'Price {current:.2f} exceeds maximum {self.max_price}',
                     'current_price': current
-                })
-
-        # Validation 3: Negative prices
-        if current is not None and current < 0:
-            errors.append({
-                'name': name,
-                'type': 'NEGATIVE_PRICE',
-                'severity': 'CRITICAL',
-                'description': f'Negative price: {current:.2f}',
-                'current_price': current
-            })
-
-        # Validation 4: Price inversion
-        if current and original and current > original:
-            errors.append({
-                'name': name,
-                'type': 'PRICE_INVERSION',
-                'severity': 'HIGH',
-                'description': f'Current price ({current:.2f}) > Original ({original:.2f})',
-                'current_price': current,
-                'original_price': original
-            })
-
-        # Validation 5: Discount range
-        if discount is not None:
-            if discount < 0:
-                errors.append({
+                }
+            elif error_type == 'NEGATIVE_PRICE':
+                error = {
+                    'name': name,
+                    'type': error_type,
+                    'severity': 'CRITICAL',
+                    'description': f'Negative price: {current:.2f}',
+                    'current_price': current
+                }
+            elif error_type == 'PRICE_INVERSION':
+                error = {
+                    'name': name,
+                    'type': error_type,
+                    'severity': 'HIGH',
+                    'description': f'Current price ({current:.2f}) > Original ({original:.2f})',
+                    'current_price': current,
+                    'original_price': original
+                }
+            elif error_type == 'NEGATIVE_DISCOUNT':
+                error = {
                     'name': name,
-                    'type': 'NEGATIVE_DISCOUNT',
+                    'type': error_type,
                     'severity': 'HIGH',
                     'description': f'Negative discount: {discount:.1f}%',
                     'discount_percentage': discount
-                })
-            elif discount > self.max_discount:
-                errors.append({
+                }
+            elif error_type == 'EXCESSIVE_DISCOUNT':
+                error = {
                     'name': name,
-                    'type': 'EXCESSIVE_DISCOUNT',
+                    'type': error_type,
                     'severity': 'MEDIUM',
                     'description': f'Discount {discount:.1f}% exceeds maximum {self.max_discount}%',
                     'discount_percentage': discount
-                })
-
-        # Validation 6: Discount calculation
-        if current and original and discount:
-            calculated_discount = ((original - current) / original) * 100 if original > 0 else 0
-            if abs(calculated_discount - discount) > 5:  # 5% tolerance
-                errors.append({
+                }
+            else:
+                error = {
                     'name': name,
-                    'type': 'DISCOUNT_CALCULATION_ERROR',
+                    'type': error_type,
                     'severity': 'MEDIUM',
                     'description': f'Discount mismatch: claimed {discount:.1f}%, calculated {calculated_discount:.1f}%',
                     'claimed_discount': discount,
                     'calculated_discount': calculated_discount
-                })
+                }
+
+            if error['severity'] in ['CRITICAL', 'HIGH']:
+                errors.append(error)
+            else:
+                warnings.append(error)
 
-        return errors
+        return errors, warnings
 
     def _empty_report(self) -> ValidationReport:
         """Return empty validation report"""
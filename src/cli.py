@@ -0,0 +1,243 @@
+"""
+Bilka Price Monitor - Command-line interface
+
+Command handlers behind `python main.py <command>`.
+"""
+
+import argparse
+import itertools
+import sys
+import os
+
+# Check if we should use mock scraper (for testing or when ChromeDriver unavailable)
+USE_MOCK_SCRAPER = os.getenv('USE_MOCK_SCRAPER', 'false').lower() == 'true'
+
+# Scraper, storage and analysis modules are imported inside the command that
+# needs them, so `init` or `dashboard` never pay for selenium/pandas start-up.
+
+
+def main():
+    """Main entry point for the Bilka Price Monitor."""
+    parser = argparse.ArgumentParser(description="Bilka Price Monitor")
+    subparsers = parser.add_subparsers(dest="command", required=True, help="Command to execute")
+
+    init_parser = subparsers.add_parser("init", help="Initialize the database and data directories")
+    init_parser.set_defaults(func=lambda args: initialize_system())
+
+    scrape_parser = subparsers.add_parser("scrape", help="Scrape products and store them")
+    scrape_parser.add_argument(
+        "--category",
+        choices=["electronics", "home", "fashion", "sports", "all"],
+        default="all",
+        help="Category to scrape (default: all)"
+    )
+    scrape_parser.add_argument(
+        "--max-products",
+        type=int,
+        default=100,
+        help="Maximum products to scrape per category (default: 100)"
+    )
+    scrape_parser.add_argument(
+        "--config",
+        default="config/settings.yaml",
+        help="Path to configuration file"
+    )
+    scrape_parser.set_defaults(
+        func=lambda args: run_scraping(args.category, args.max_products, args.config)
+    )
+
+    analyze_parser = subparsers.add_parser("analyze", help="Run discount analysis on stored data")
+    analyze_parser.add_argument("--output", help="Output file for analysis results")
+    analyze_parser.set_defaults(func=lambda args: run_analysis(args.output))
+
+    validate_parser = subparsers.add_parser("validate", help="Run price validation on stored data")
+    validate_parser.add_argument("--output", help="Output file for validation results")
+    validate_parser.set_defaults(func=lambda args: run_validation(args.output))
+
+    dashboard_parser = subparsers.add_parser("dashboard", help="Start the Streamlit dashboard")
+    dashboard_parser.set_defaults(func=lambda args: run_dashboard())
+
+    args = parser.parse_args()
+
+    try:
+        args.func(args)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+def initialize_system():
+    """Initialize the system and database."""
+    from src.data.storage import initialize_database
+
+    print("Initializing Bilka Price Monitor system...")
+
+    # Initialize database
+    initialize_database()
+    print("✅ Database initialized")
+
+    # Create data directories
+    directories = ["data/raw", "data/processed", "data/exports", "logs"]
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+        print(f"✅ Created directory: {directory}")
+
+    print("🎉 System initialization complete!")
+
+
+def run_scraping(category: str, max_products: int, config_path: str):
+    """Run the scraping process."""
+    if USE_MOCK_SCRAPER:
+        from src.scraper.mock_scraper import MockBilkaScraper as BilkaScraper
+        print("⚠️ Using Mock Scraper (set USE_MOCK_SCRAPER=false for real web scraping)")
+    else:
+        from src.scraper.bilka_scraper import BilkaScraper
+        print("✓ Using Real Web Scraper")
+    from src.data.storage import create_data_storage
+    from src.data.processor import process_products
+
+    print(f"Starting scraping for category: {category}")
+    print(f"Max products per category: {max_products}")
+
+    scraper = BilkaScraper(config_path=config_path)
+
+    if category == "all":
+        results = scraper.scrape_all_categories(max_products)
+        total_products = sum(len(products) for products in results.values())
+        print(f"✅ Scraped {total_products} products across all categories")
+
+        for cat, products in results.items():
+            print(f"  - {cat}: {len(products)} products")
+
+        # Process every category, then store them in one transaction
+        all_processed = list(itertools.chain.from_iterable(
+            process_products(products) for products in results.values() if products
+        ))
+        data_storage = create_data_storage()
+        store_results = data_storage.bulk_store(all_processed)
+        total_stored = store_results.get('successful', 0)
+        total_failed = store_results.get('failed', 0)
+        print(f"✅ Stored {total_stored} products successfully ({total_failed} failed)")
+    else:
+        products = scraper.scrape_category(category, max_products)
+        print(f"✅ Scraped {len(products)} products from {category}")
+
+        # Process and store the data
+        if products:
+            processed_products = process_products(products)
+            data_storage = create_data_storage()
+            results = data_storage.bulk_store(processed_products)
+            print(f"✅ Stored {results['successful']} products successfully")
+
+
+def run_analysis(output_file: str = None):
+    """Run discount analysis on stored data."""
+    from src.data.storage import create_data_storage
+    from src.analysis.discount_analyzer import analyze_product_discounts
+
+    print("Running discount analysis...")
+
+    data_storage = create_data_storage()
+
+    df = data_storage.get_products_df(limit=5000)
+    if df.empty:
+        print("⚠️ No products found in database. Run `python main.py scrape ...` first.")
+        return
+
+    analysis = analyze_product_discounts(df)
+
+    print("📊 Analysis Results:")
+    print(f"  Total Products: {analysis.total_products}")
+    print(f"  Products with Discounts: {analysis.products_with_discount}")
+    print(f"  Average Discount: {analysis.average_discount:.1f}%")
+    print(f"  Max Discount: {analysis.max_discount:.1f}%")
+    print(f"  Potential Errors: {len(analysis.potential_errors)}")
+
+    if analysis.potential_errors:
+        print("\n🚨 Top Errors:")
+        for i, error in enumerate(analysis.potential_errors[:5]):
+            print(f"  {i+1}. {error['name']}: {error['description']}")
+
+    if output_file:
+        # Save analysis results
+        import json
+        results = {
+            'summary': {
+                'total_products': analysis.total_products,
+                'products_with_discount': analysis.products_with_discount,
+                'average_discount': analysis.average_discount,
+                'max_discount': analysis.max_discount
+            },
+            'errors': analysis.potential_errors,
+            'high_discount_products': analysis.high_discount_products
+        }
+
+        with open(output_file, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"✅ Analysis results saved to {output_file}")
+
+
+def run_validation(output_file: str = None):
+    """Run price validation on stored data."""
+    from src.data.storage import create_data_storage
+    from src.analysis.price_validator import validate_product_prices
+
+    print("Running price validation...")
+
+    data_storage = create_data_storage()
+    df = data_storage.get_products_df(limit=5000)
+    if df.empty:
+        print("⚠️ No products found in database. Run `python main.py scrape ...` first.")
+        return
+
+    validation_report = validate_product_prices(df)
+
+    print("🔍 Validation Results:")
+    print(f"  Total Products: {validation_report.total_products}")
+    print(f"  Valid Products: {validation_report.valid_products}")
+    print(f"  Invalid Products: {validation_report.invalid_products}")
+    print(f"  Validation Rate: {validation_report.valid_products/validation_report.total_products*100:.1f}%")
+
+    if validation_report.anomaly_summary:
+        print("\n📋 Error Breakdown:")
+        for error_type, count in validation_report.anomaly_summary.items():
+            print(f"  {error_type}: {count}")
+
+    if validation_report.recommendations:
+        print("\n💡 Recommendations:")
+        for rec in validation_report.recommendations:
+            print(f"  • {rec}")
+
+    if output_file:
+        # Save validation results
+        import json
+        results = {
+            'summary': {
+                'total_products': validation_report.total_products,
+                'valid_products': validation_report.valid_products,
+                'invalid_products': validation_report.invalid_products,
+                'validation_rate': validation_report.valid_products/validation_report.total_products*100
+            },
+            'errors': validation_report.errors,
+            'warnings': validation_report.warnings,
+            'validation_passed': validation_report.validation_passed
+        }
+
+        with open(output_file, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"✅ Validation results saved to {output_file}")
+
+
+def run_dashboard():
+    """Run the Streamlit dashboard."""
+    print("Starting Streamlit dashboard...")
+    print("Open your browser to http://localhost:8501")
+
+    try:
+        from src.ui.dashboard import main
+        main()
+    except ImportError as e:
+        print(f"❌ Error importing dashboard: {e}")
+        print("Make sure all dependencies are installed:")
+        print("  pip install -r requirements.txt")
+        sys.exit(1)
@@ -4,13 +4,15 @@ Data storage and database operations
 
 import os
 import logging
+from bisect import insort
+from functools import lru_cache
 from typing import Dict, List, Optional
 from datetime import datetime, UTC
 
 from pathlib import Path
 
 import yaml
-from sqlalchemy import create_engine, func
+from sqlalchemy import create_engine, event, func, or_, select
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -18,6 +20,18 @@ from .models import Base, Product, PriceHistory, ScrapeLog, AnomalyDetection
 
 logger = logging.getLogger(__name__)
 
+PRODUCT_DF_COLUMNS = [
+    'external_id', 'name', 'category', 'current_price', 'original_price',
+    'discount_percentage', 'url', 'scraped_at'
+]
+# Prices stay float64: float32 cannot hold values like 12.99 exactly, which
+# would leak into exported JSON and threshold comparisons.
+PRODUCT_PRICE_DTYPES = {
+    'current_price': 'float64',
+    'original_price': 'float64',
+    'discount_percentage': 'float64',
+}
+
 
 def _resolve_database_url(database_url: Optional[str]) -> str:
     """Resolve database URL from explicit arg, env var, or config file."""
@@ -53,6 +67,23 @@ def _resolve_database_url(database_url: Optional[str]) -> str:
         return "sqlite:///data/bilka_prices.db"
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling so a commit costs one sequential append, not a full sync."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+    # pysqlite only opens a transaction before DML, so a SAVEPOINT issued first
+    # would start (and its RELEASE commit) the transaction itself; leave
+    # BEGIN to SQLAlchemy instead (see _begin_sqlite_transaction)
+    dbapi_connection.isolation_level = None
+
+
+def _begin_sqlite_transaction(connection):
+    """Emit the BEGIN that pysqlite no longer sends on its own"""
+    connection.exec_driver_sql("BEGIN")
+
+
 def reset_database(database_url: Optional[str] = None):
     """
     Reset the database by dropping all tables and recreating them
@@ -88,13 +119,72 @@ def create_data_storage(database_url: Optional[str] = None) -> 'DataStorage':
     """
     Create a DataStorage instance
     
+    Instances are shared per resolved URL, so repeated calls reuse the same
+    engine and connection pool.
+    
     Args:
         database_url: Database connection URL
         
     Returns:
         DataStorage instance
     """
-    return DataStorage(_resolve_database_url(database_url))
+    return _shared_data_storage(_resolve_database_url(database_url))
+
+
+@lru_cache(maxsize=None)
+def _shared_data_storage(database_url: str) -> 'DataStorage':
+    """Build one DataStorage per database URL"""
+    return DataStorage(database_url)
+
+
+class _KnownProducts:
+    """
+    Stored products matching a bulk_store batch, indexed by upsert key
+
+    Stands in for the per-row lookup queries. Products sharing a key are kept
+    in id order, the order those queries returned them in.
+    """
+
+    KEYS = ('external_id', 'url', 'name')
+
+    def __init__(self, session: Session, products: List[Dict]):
+        self._index: Dict[str, Dict[str, List[Product]]] = {key: {} for key in self.KEYS}
+
+        values = {key: set() for key in self.KEYS}
+        for product_data in products:
+            for key in self.KEYS:
+                value = (product_data.get(key) or '').strip()
+                if value:
+                    values[key].add(value)
+
+        conditions = [getattr(Product, key).in_(wanted) for key, wanted in values.items() if wanted]
+        if conditions:
+            for product in session.scalars(select(Product).where(or_(*conditions)).order_by(Product.id)):
+                self.remember(product)
+
+    def product_ids(self) -> List[int]:
+        """Ids of every indexed product"""
+        return sorted({
+            product.id
+            for index in self._index.values()
+            for candidates in index.values()
+            for product in candidates
+        })
+
+    def lookup(self, key: str, value: str) -> Optional[Product]:
+        """First product whose ``key`` currently equals ``value``"""
+        # Skip products whose key was changed by an earlier row
+        return next((p for p in self._index[key].get(value, ()) if getattr(p, key) == value), None)
+
+    def remember(self, product: Product):
+        """Index a flushed product under its current upsert keys"""
+        for key in self.KEYS:
+            value = getattr(product, key)
+            if not value:
+                continue
+            candidates = self._index[key].setdefault(value, [])
+            if not any(candidate is product for candidate in candidates):
+                insort(candidates, product, key=lambda candidate: candidate.id)
 
 
 class DataStorage:
@@ -102,7 +192,11 @@ class DataStorage:
 
     def __init__(self, database_url: str = "sqlite:///data/bilka_prices.db"):
         self.database_url = database_url
-        self.engine = create_engine(database_url, echo=False)
+        # Pre-ping so long-lived processes (the dashboard) survive dropped connections
+        self.engine = create_engine(database_url, echo=False, pool_pre_ping=True)
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+            event.listen(self.engine, "begin", _begin_sqlite_transaction)
         self.SessionLocal = sessionmaker(bind=self.engine)
 
     def get_session(self) -> Session:
@@ -126,37 +220,7 @@ class DataStorage:
                 logger.error("Refusing to store product without a name")
                 return None
 
-            external_id = (product_data.get('external_id') or '').strip() or None
-            url = (product_data.get('url') or '').strip() or None
-
-            # Prefer stable identifiers for upsert.
-            existing = None
-            if external_id:
-                existing = session.query(Product).filter_by(external_id=external_id).first()
-            if existing is None and url:
-                existing = session.query(Product).filter_by(url=url).first()
-            if existing is None:
-                # Last resort (not stable): name.
-                existing = session.query(Product).filter_by(name=name).first()
-
-            if existing:
-                # Update existing product
-                for key, value in product_data.items():
-                    if hasattr(existing, key):
-                        setattr(existing, key, value)
-                existing.updated_at = datetime.now(UTC)
-                product = existing
-            else:
-                # Create new product
-                product_data = dict(product_data)
-                product_data['name'] = name
-                if external_id:
-                    product_data['external_id'] = external_id
-                if url:
-                    product_data['url'] = url
-                product = Product(**product_data)
-                session.add(product)
-
+            product = self._upsert_product(session, product_data, name)
             session.commit()
             session.refresh(product)
 
@@ -173,10 +237,97 @@ class DataStorage:
         finally:
             session.close()
 
+    def _upsert_product(self, session: Session, product_data: Dict, name: str,
+                        known: Optional[_KnownProducts] = None) -> Product:
+        """
+        Update the matching product or add a new one to the session (no commit)
+
+        ``known`` indexes the batch's stored products; without it, each key is
+        looked up with its own query.
+        """
+        external_id = (product_data.get('external_id') or '').strip() or None
+        url = (product_data.get('url') or '').strip() or None
+
+        def lookup(key: str, value: str) -> Optional[Product]:
+            if known is not None:
+                return known.lookup(key, value)
+            return session.query(Product).filter_by(**{key: value}).first()
+
+        # Prefer stable identifiers for upsert.
+        existing = None
+        if external_id:
+            existing = lookup('external_id', external_id)
+        if existing is None and url:
+            existing = lookup('url', url)
+        if existing is None:
+            # Last resort (not stable): name.
+            existing = lookup('name', name)
+
+        if existing:
+            # Update existing product
+            for key, value in product_data.items():
+                if hasattr(existing, key):
+                    setattr(existing, key, value)
+            existing.updated_at = datetime.now(UTC)
+            product = existing
+        else:
+            # Create new product
+            product_data = dict(product_data)
+            product_data['name'] = name
+            if external_id:
+                product_data['external_id'] = external_id
+            if url:
+                product_data['url'] = url
+            product = Product(**product_data)
+            session.add(product)
+
+        return product
+
     def _store_price_history(self, session: Session, product: Product):
         """Store price history for a product"""
         try:
-            # Avoid inserting identical consecutive records.
+            price_entry = self._new_price_entry(session, product)
+            if price_entry is not None:
+                session.add(price_entry)
+                session.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"Error storing price history: {e}")
+
+    def _latest_price_entries(self, session: Session, product_ids: List[int]) -> Dict[int, PriceHistory]:
+        """Newest price history row per product, fetched in one query"""
+        if not product_ids:
+            return {}
+
+        latest = (
+            select(PriceHistory.product_id, func.max(PriceHistory.recorded_at).label('recorded_at'))
+            .where(PriceHistory.product_id.in_(product_ids))
+            .group_by(PriceHistory.product_id)
+            .subquery()
+        )
+        entries = session.scalars(
+            select(PriceHistory).join(
+                latest,
+                (PriceHistory.product_id == latest.c.product_id)
+                & (PriceHistory.recorded_at == latest.c.recorded_at)
+            )
+        )
+        return {entry.product_id: entry for entry in entries}
+
+    def _new_price_entry(self, session: Session, product: Product,
+                         latest: Optional[Dict[int, PriceHistory]] = None) -> Optional[PriceHistory]:
+        """
+        Build a price history row, or None if there is no new price to record
+
+        ``latest`` maps product ids to their newest history row when a batch
+        has already fetched them; otherwise the newest row is queried here.
+        """
+        if product.current_price is None:
+            return None
+
+        # Avoid inserting identical consecutive records.
+        if latest is not None:
+            last = latest.get(product.id)
+        else:
             last = (
                 session.query(PriceHistory)
                 .filter(PriceHistory.product_id == product.id)
@@ -184,24 +335,20 @@ class DataStorage:
                 .first()
             )
 
-            if last is not None:
-                if (
-                    last.price == product.current_price
-                    and last.original_price == product.original_price
-                    and last.discount_percentage == product.discount_percentage
-                ):
-                    return
-
-            price_entry = PriceHistory(
-                product_id=product.id,
-                price=product.current_price,
-                original_price=product.original_price,
-                discount_percentage=product.discount_percentage
-            )
-            session.add(price_entry)
-            session.commit()
-        except SQLAlchemyError as e:
-            logger.warning(f"Error storing price history: {e}")
+        if last is not None:
+            if (
+                last.price == product.current_price
+                and last.original_price == product.original_price
+                and last.discount_percentage == product.discount_percentage
+            ):
+                return None
+
+        return PriceHistory(
+            product_id=product.id,
+            price=product.current_price,
+            original_price=product.original_price,
+            discount_percentage=product.discount_percentage
+        )
 
     def store_multiple_products(self, products: List[Dict]) -> Dict:
         """
@@ -226,6 +373,67 @@ class DataStorage:
         logger.info(f"Stored {results['successful']}/{len(products)} products successfully")
         return results
 
+    def bulk_store(self, products: List[Dict]) -> Dict:
+        """
+        Store many products and their price history in a single transaction
+
+        Unlike store_multiple_products, which commits once per product, this
+        commits once for the whole batch. Each product is written in its own
+        savepoint, so a database error fails only that product.
+
+        Args:
+            products: List of product dictionaries
+
+        Returns:
+            Dictionary with success/failure counts
+        """
+        results = {'successful': 0, 'failed': 0, 'errors': []}
+        session = self.get_session()
+        try:
+            with session.begin():
+                known = _KnownProducts(session, products)
+                # Products the batch adds have no history yet
+                latest = self._latest_price_entries(session, known.product_ids())
+                for product_data in products:
+                    name = (product_data.get('name') or '').strip()
+                    if not name:
+                        results['failed'] += 1
+                        results['errors'].append(product_data.get('name', 'Unknown'))
+                        continue
+                    try:
+                        with session.begin_nested():
+                            product = self._upsert_product(session, product_data, name, known)
+                            # Surface this product's constraint errors inside its savepoint
+                            session.flush()
+                            price_entry = self._new_price_entry(session, product, latest)
+                            if price_entry is not None:
+                                session.add(price_entry)
+                    except SQLAlchemyError as e:
+                        logger.error(f"Error storing product: {e}")
+                        results['failed'] += 1
+                        results['errors'].append(product_data.get('name', 'Unknown'))
+                        # The rollback expunged or expired what the index holds
+                        known = _KnownProducts(session, products)
+                        continue
+                    # Later rows of the batch must find this product, as a query would
+                    known.remember(product)
+                    if price_entry is not None:
+                        # A product listed twice in the batch compares against this row
+                        latest[product.id] = price_entry
+                    results['successful'] += 1
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk storing products: {e}")
+            results = {
+                'successful': 0,
+                'failed': len(products),
+                'errors': [p.get('name', 'Unknown') for p in products]
+            }
+        finally:
+            session.close()
+
+        logger.info(f"Stored {results['successful']}/{len(products)} products successfully")
+        return results
+
     def get_products(self, category: Optional[str] = None, limit: int = 100) -> List[Product]:
         """
         Retrieve products from the database
@@ -256,6 +464,51 @@ class DataStorage:
         finally:
             session.close()
 
+    def get_products_df(self, category: Optional[str] = None, limit: int = 5000):
+        """
+        Retrieve products as a pandas DataFrame for analysis
+
+        Selects only the analysed columns straight into pandas, skipping ORM
+        object construction.
+
+        Args:
+            category: Filter by category (optional)
+            limit: Maximum number of products to retrieve
+
+        Returns:
+            DataFrame with one row per product, newest first
+        """
+        import pandas as pd
+
+        query = select(
+            Product.external_id,
+            Product.name,
+            Product.category,
+            Product.current_price,
+            Product.original_price,
+            func.coalesce(Product.discount_percentage, 0).label('discount_percentage'),
+            Product.url,
+            Product.scraped_at,
+        )
+        if category:
+            query = query.where(Product.category == category)
+        query = query.order_by(Product.scraped_at.desc()).limit(limit)
+
+        try:
+            # Ensure tables exist
+            Base.metadata.create_all(self.engine)
+
+            with self.engine.connect() as connection:
+                return pd.read_sql_query(
+                    query,
+                    connection,
+                    parse_dates=['scraped_at'],
+                    dtype=PRODUCT_PRICE_DTYPES
+                )
+        except Exception as e:
+            logger.error(f"Error retrieving products: {e}")
+            return pd.DataFrame(columns=PRODUCT_DF_COLUMNS).astype(PRODUCT_PRICE_DTYPES)
+
     def get_product_price_history(self, product_id: int) -> List[PriceHistory]:
         """Get price history for a specific product"""
         session = self.get_session()
@@ -7,8 +7,14 @@ import yaml
 import logging
 import random
 import time
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -23,6 +29,9 @@ logger = logging.getLogger(__name__)
 class BilkaScraper:
     """Main scraper class for Bilka.dk"""
 
+    # Pooled HTTP session shared by all scrapers for the plain-HTML fast path
+    _http_session: Optional[requests.Session] = None
+
     def __init__(self, config_path: str = "config/settings.yaml"):
         self.config = self._load_config(config_path)
         self.base_url = self.config.get('bilka', {}).get('base_url', 'https://bilka.dk')
@@ -34,15 +43,18 @@ class BilkaScraper:
 
         # Initialize components
         scraping_config = self.config.get('scraping', {})
-        self.session_manager = SessionManager(
-            headless=scraping_config.get('headless', True)
-        )
+        self.headless = scraping_config.get('headless', True)
+        self.session_manager = SessionManager(headless=self.headless)
         self.parser = ProductParser(self.rules.get('selectors', {}))
 
         self.max_retries = scraping_config.get('max_retries', 3)
         self.timeout = scraping_config.get('timeout', 30)
         self.delay_min = scraping_config.get('request_delay_min', 2)
         self.delay_max = scraping_config.get('request_delay_max', 5)
+        # Categories scraped concurrently, each in its own browser
+        self.max_workers = scraping_config.get('max_workers', 4)
+        # Try a plain HTTP fetch of listing pages before starting a browser
+        self.http_fast_path = scraping_config.get('http_fast_path', True)
 
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file"""
@@ -67,17 +79,20 @@ class BilkaScraper:
         delay = random.uniform(self.delay_min, self.delay_max)
         time.sleep(delay)
 
-    def scrape_category(self, category: str, max_products: int = 100) -> List[Dict]:
+    def scrape_category(self, category: str, max_products: int = 100,
+                        session_manager: Optional[SessionManager] = None) -> List[Dict]:
         """
         Scrape products from a specific category
         
         Args:
             category: Category name (electronics, home, fashion, sports)
             max_products: Maximum number of products to scrape
+            session_manager: Browser session to use (defaults to the scraper's own)
             
         Returns:
             List of product dictionaries
         """
+        session_manager = session_manager or self.session_manager
         logger.info(f"Starting scrape for category: {category}")
 
         # Get category URL
@@ -95,11 +110,16 @@ class BilkaScraper:
             logger.error("Missing selector 'product_container' in scraping rules")
             return []
 
+        if self.http_fast_path:
+            products = self._scrape_category_over_http(url, category, max_products)
+            if products:
+                return products
+
         logger.info(f"Looking for selector: {product_container_selector}")
         products = []
 
         try:
-            with self.session_manager as driver:
+            with session_manager as driver:
                 # Navigate to category page with retries
                 last_error: Exception | None = None
                 for attempt in range(1, self.max_retries + 1):
@@ -181,6 +201,46 @@ class BilkaScraper:
 
         return products
 
+    @classmethod
+    def _get_http_session(cls) -> requests.Session:
+        """Create the shared pooled HTTP session on first use"""
+        if cls._http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            cls._http_session = session
+        return cls._http_session
+
+    def _scrape_category_over_http(self, url: str, category: str, max_products: int) -> List[Dict]:
+        """
+        Fetch a listing page without a browser and parse it
+
+        Returns an empty list when the page cannot be fetched or its products
+        are rendered client-side, so the caller can fall back to Selenium.
+        """
+        try:
+            response = self._get_http_session().get(
+                url,
+                headers={'User-Agent': self.session_manager.user_agent},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.info(f"HTTP fetch failed ({e}), falling back to browser")
+            return []
+
+        products = self.parser.parse_products(response.text)[:max_products]
+        if not products:
+            logger.info("No products in static HTML, falling back to browser")
+            return []
+
+        for product in products:
+            product['category'] = category
+
+        logger.info(f"Scraped {len(products)} products from {category} over HTTP")
+        return products
+
     def _scroll_page(self, driver, max_products: int):
         """Scroll page to load more products dynamically"""
         last_height = driver.execute_script("return document.body.scrollHeight")
@@ -227,13 +287,30 @@ class BilkaScraper:
             Dictionary mapping category names to product lists
         """
         logger.info("Starting scrape for all categories")
-        results = {}
-
-        for category in self.categories.keys():
-            logger.info(f"Scraping category: {category}")
-            products = self.scrape_category(category, max_products_per_category)
-            results[category] = products
-            self._random_delay()  # Delay between categories
+        categories = list(self.categories.keys())
+        max_workers = min(self.max_workers, len(categories))
+
+        if max_workers <= 1:
+            results = {}
+            for category in categories:
+                logger.info(f"Scraping category: {category}")
+                products = self.scrape_category(category, max_products_per_category)
+                results[category] = products
+                self._random_delay()  # Delay between categories
+        else:
+            # Page loads are network-bound, so categories run side by side,
+            # each worker driving its own browser on its own debugging port
+            def scrape_in_own_session(index: int, category: str) -> List[Dict]:
+                logger.info(f"Scraping category: {category}")
+                session_manager = SessionManager(
+                    headless=self.headless,
+                    remote_debugging_port=self.session_manager.remote_debugging_port + 1 + index
+                )
+                return self.scrape_category(category, max_products_per_category, session_manager)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                scraped = executor.map(scrape_in_own_session, range(len(categories)), categories)
+                results = dict(zip(categories, scraped))
 
         total_products = sum(len(products) for products in results.values())
         logger.info(f"Completed scraping all categories: {total_products} total products")
@@ -254,29 +331,79 @@ class BilkaScraper:
 
         try:
             with self.session_manager as driver:
-                driver.get(url)
-                self._random_delay()
-
-                # Wait for page load
-                try:
-                    WebDriverWait(driver, self.timeout).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
-                    )
-                except TimeoutException:
-                    logger.warning(f"Timeout loading product page: {url}")
-                    return None
+                return self._scrape_product_page(driver, url)
+        except Exception as e:
+            logger.error(f"Error scraping single product {url}: {e}")
 
-                html = driver.page_source
-                products = self.parser.parse_products(html)
+        return None
+
+    def scrape_urls(self, urls: List[str], max_workers: Optional[int] = None) -> List[Optional[Dict]]:
+        """
+        Scrape several product pages concurrently
+        
+        Each worker thread starts one browser on first use and keeps it for
+        all the URLs it handles; every browser is closed when the batch is done.
+        
+        Args:
+            urls: Full product URLs
+            max_workers: Number of concurrent browsers (defaults to scraping.max_workers)
+            
+        Returns:
+            Product dictionaries (None where scraping failed), in the order of urls
+        """
+        if not urls:
+            return []
 
-                if products:
-                    product = products[0]
-                    product['url'] = url
-                    logger.info(f"Successfully scraped product: {product.get('name')}")
-                    return product
+        max_workers = min(max_workers or self.max_workers, len(urls))
+        thread_state = threading.local()
+        sessions: List[SessionManager] = []
+        ports = itertools.count(self.session_manager.remote_debugging_port + 1)
+
+        def scrape_url(url: str) -> Optional[Dict]:
+            session_manager = getattr(thread_state, 'session_manager', None)
+            if session_manager is None:
+                session_manager = SessionManager(
+                    headless=self.headless, remote_debugging_port=next(ports)
+                )
+                thread_state.session_manager = session_manager
+                sessions.append(session_manager)
+
+            logger.info(f"Scraping product: {url}")
+            try:
+                return self._scrape_product_page(session_manager.get_driver(), url)
+            except Exception as e:
+                logger.error(f"Error scraping product {url}: {e}")
+                return None
 
-        except Exception as e:
-            logger.error(f"Error scraping single product {url}: {e}")
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(scrape_url, urls))
+        finally:
+            for session_manager in sessions:
+                session_manager.close()
+
+    def _scrape_product_page(self, driver, url: str) -> Optional[Dict]:
+        """Load a product page in the given driver and parse it"""
+        driver.get(url)
+        self._random_delay()
+
+        # Wait for page load
+        try:
+            WebDriverWait(driver, self.timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
+            )
+        except TimeoutException:
+            logger.warning(f"Timeout loading product page: {url}")
+            return None
+
+        html = driver.page_source
+        products = self.parser.parse_products(html)
+
+        if products:
+            product = products[0]
+            product['url'] = url
+            logger.info(f"Successfully scraped product: {product.get('name')}")
+            return product
 
         return None
 
@@ -125,3 +125,7 @@ class MockBilkaScraper:
                 break
 
         return self._generate_product(0, category)
+
+    def scrape_urls(self, urls: List[str], max_workers: Optional[int] = None) -> List[Optional[Dict]]:
+        """Generate a mock product for each URL"""
+        return [self.scrape_single_product(url) for url in urls]
@@ -4,7 +4,7 @@ Product Parser for extracting product data from HTML
 
 import re
 from typing import Dict, Optional, List
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -174,12 +174,25 @@ class ProductParser:
             logger.warning(f"Failed to parse product element: {e}")
             return None
 
+    def _container_strainer(self) -> Optional[SoupStrainer]:
+        """Build a SoupStrainer for simple 'tag.class' container selectors"""
+        match = re.fullmatch(r'([a-zA-Z][\w-]*)?\.([\w-]+)', self.selectors['product_container'].strip())
+        if not match:
+            return None
+
+        tag, css_class = match.groups()
+        # Match the class as a whole token; the raw attribute is not split while straining
+        class_pattern = re.compile(rf'(?:^|\s){re.escape(css_class)}(?:\s|$)')
+        return SoupStrainer(tag, class_=class_pattern)
+
     def parse_products(self, html: str) -> List[Dict]:
         """Parse multiple products from HTML"""
         logger.info(f"Parsing HTML of length {len(html)}")
         logger.info(f"Using selector: {self.selectors['product_container']}")
         
-        soup = BeautifulSoup(html, 'html.parser')
+        # Only materialize the product cards when the container selector allows it
+        strainer = self._container_strainer()
+        soup = BeautifulSoup(html, 'lxml', parse_only=strainer)
         product_elements = soup.select(self.selectors['product_container'])
         
         logger.info(f"Found {len(product_elements)} product elements with selector '{self.selectors['product_container']}'")
@@ -187,18 +200,24 @@ class ProductParser:
         # Debug: Try alternative selectors if main one fails
         if len(product_elements) == 0:
             logger.error("No products found with main selector, trying alternatives...")
+            if strainer is not None:
+                # The strained tree only holds matching cards, so re-parse the full page
+                soup = BeautifulSoup(html, 'lxml')
             
-            # Try just .product-card
-            alt1 = soup.select('.product-card')
-            logger.error(f"DEBUG: Found {len(alt1)} elements with '.product-card'")
-            
-            # Try a[class*="product"]
-            alt2 = soup.select('a[class*="product"]')
-            logger.error(f"DEBUG: Found {len(alt2)} elements with 'a[class*=\"product\"]'")
-            
-            # Try all <a> tags
-            alt3 = soup.select('a')
-            logger.error(f"DEBUG: Found {len(alt3)} total <a> tags")
+            # Count the alternative selectors in a single walk over the tree
+            card_count = product_link_count = link_count = 0
+            for tag in soup.find_all(True):
+                classes = tag.get('class') or []
+                if 'product-card' in classes:
+                    card_count += 1
+                if tag.name == 'a':
+                    link_count += 1
+                    if 'product' in ' '.join(classes):
+                        product_link_count += 1
+
+            logger.error(f"DEBUG: Found {card_count} elements with '.product-card'")
+            logger.error(f"DEBUG: Found {product_link_count} elements with 'a[class*=\"product\"]'")
+            logger.error(f"DEBUG: Found {link_count} total <a> tags")
             
             # Save snippet of HTML for debugging
             if len(html) > 0:
@@ -15,11 +15,18 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Subresources that never affect the scraped HTML. Stylesheets are kept:
+# the category pages load more products as the (styled) page is scrolled.
+BLOCKED_URL_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg", "*.woff", "*.woff2"]
+
+
 class SessionManager:
     """Manages Chrome WebDriver sessions with stealth capabilities"""
 
-    def __init__(self, headless: bool = True, user_agent: Optional[str] = None):
+    def __init__(self, headless: bool = True, user_agent: Optional[str] = None,
+                 remote_debugging_port: int = 9222):
         self.headless = headless
+        self.remote_debugging_port = remote_debugging_port
         self.user_agent = user_agent or self._get_random_user_agent()
         self.driver: Optional[webdriver.Chrome] = None
 
@@ -53,13 +60,19 @@ class SessionManager:
         # Performance optimizations
         options.add_argument("--disable-extensions")
         options.add_argument("--disable-plugins")
+        # Product data comes from the DOM, so skip image downloads and prompts
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
         
         # Privacy settings
         options.add_argument("--incognito")
         
         # Additional options for Streamlit Cloud / Linux
         options.add_argument("--disable-setuid-sandbox")
-        options.add_argument("--remote-debugging-port=9222")
+        options.add_argument(f"--remote-debugging-port={self.remote_debugging_port}")
 
         return options
 
@@ -99,6 +112,13 @@ class SessionManager:
                 """
             })
 
+            # Block heavy subresources at the network layer
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+            except Exception as e:
+                logger.warning(f"Could not block subresources: {e}")
+
             self.driver = driver
             logger.info("Chrome WebDriver initialized successfully")
             return driver
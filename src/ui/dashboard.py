@@ -4,6 +4,7 @@ Interactive UI for monitoring prices and identifying good deals
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -20,6 +21,10 @@ from src.analysis.discount_analyzer import DiscountAnalyzer
 from src.analysis.price_validator import PriceValidator
 from src.analysis.anomaly_detector import AnomalyDetector
 
+# Right-closed discount buckets for the analytics chart: (0, 10], (10, 25], ...
+DISCOUNT_BIN_EDGES = np.array([0, 10, 25, 50, 75, 90, 100], dtype=np.float64)
+DISCOUNT_BIN_LABELS = ['0-10%', '10-25%', '25-50%', '50-75%', '75-90%', '90-100%']
+
 
 def main():
     """Main dashboard application"""
@@ -245,7 +250,7 @@ def display_dashboard(storage: DataStorage, min_confidence: float, show_suspicio
 
     # Get products from database
     try:
-        products = storage.get_products(limit=500)
+        df = storage.get_products_df(limit=500).drop(columns='external_id')
     except Exception as e:
         st.error("⚠️ Database not initialized. Click 'Start Scraping' to begin collecting data from Bilka.dk")
         st.info("""
@@ -268,7 +273,7 @@ def display_dashboard(storage: DataStorage, min_confidence: float, show_suspicio
         """)
         return
 
-    if not products:
+    if df.empty:
         st.info("""
         **Welcome to Bilka Price Monitor! 🛒**
         
@@ -289,33 +294,25 @@ def display_dashboard(storage: DataStorage, min_confidence: float, show_suspicio
         """)
         return
 
-    # Convert to DataFrame
-    df = pd.DataFrame([{
-        'name': p.name,
-        'category': p.category,
-        'current_price': p.current_price,
-        'original_price': p.original_price,
-        'discount_percentage': p.discount_percentage or 0,
-        'url': p.url,
-        'scraped_at': p.scraped_at
-    } for p in products])
-
-    # Dashboard metrics
+    # Dashboard metrics, computed on one float64 view of the discounts
+    discounts = df['discount_percentage'].to_numpy(dtype=np.float64)
+    on_sale = discounts > 0
+    discounted = int(np.count_nonzero(on_sale))
+
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
         st.metric("📊 Total Products", f"{len(df):,}")
 
     with col2:
-        discounted = len(df[df['discount_percentage'] > 0])
         st.metric("🏷️ On Sale", f"{discounted:,}")
 
     with col3:
-        avg_discount = df[df['discount_percentage'] > 0]['discount_percentage'].mean()
+        avg_discount = discounts[on_sale].mean() if discounted else float('nan')
         st.metric("💰 Avg Discount", f"{avg_discount:.1f}%")
 
     with col4:
-        high_discount = len(df[df['discount_percentage'] >= 70])
+        high_discount = int(np.count_nonzero(discounts >= 70))
         st.metric("⚡ High Discounts (70%+)", f"{high_discount:,}")
 
     st.markdown("---")
@@ -383,6 +380,11 @@ def display_suspicious_deals(df: pd.DataFrame, min_confidence: float):
         st.success("✅ No highly suspicious deals found in current dataset")
 
 
+def format_column(values: pd.Series, template: str, missing: str) -> pd.Series:
+    """Format a numeric column with one bound str.format, leaving NaN as `missing`"""
+    return values.map(template.format, na_action='ignore').fillna(missing)
+
+
 def display_all_products(df: pd.DataFrame, show_suspicious_only: bool):
     """Display all products table"""
     st.subheader("📋 Product List")
@@ -394,22 +396,19 @@ def display_all_products(df: pd.DataFrame, show_suspicious_only: bool):
         df_filtered = df
         st.write(f"Showing all {len(df_filtered)} products")
 
-    # Format for display
-    display_df = df_filtered.copy()
-    display_df = display_df.sort_values('discount_percentage', ascending=False)
+    # Format for display; sort_values already returns a new frame, so only
+    # the shown columns are sorted and formatted, without a defensive copy
+    display_df = df_filtered[
+        ['name', 'category', 'current_price', 'original_price', 'discount_percentage']
+    ].sort_values('discount_percentage', ascending=False)
 
-    display_df['current_price'] = display_df['current_price'].apply(
-        lambda x: f"kr {x:.2f}" if pd.notna(x) else "N/A"
-    )
-    display_df['original_price'] = display_df['original_price'].apply(
-        lambda x: f"kr {x:.2f}" if pd.notna(x) else "N/A"
-    )
-    display_df['discount_percentage'] = display_df['discount_percentage'].apply(
-        lambda x: f"{x:.1f}%" if x > 0 else "-"
-    )
+    display_df['current_price'] = format_column(display_df['current_price'], "kr {:.2f}", "N/A")
+    display_df['original_price'] = format_column(display_df['original_price'], "kr {:.2f}", "N/A")
+    discounts = display_df['discount_percentage']
+    display_df['discount_percentage'] = format_column(discounts.where(discounts > 0), "{:.1f}%", "-")
 
     st.dataframe(
-        display_df[['name', 'category', 'current_price', 'original_price', 'discount_percentage']],
+        display_df,
         use_container_width=True,
         hide_index=True
     )
@@ -431,16 +430,15 @@ def display_analytics(df: pd.DataFrame):
 
     # Discount distribution
     st.write("**Discount Distribution**")
-    discount_bins = pd.cut(
-        df[df['discount_percentage'] > 0]['discount_percentage'],
-        bins=[0, 10, 25, 50, 75, 90, 100],
-        labels=['0-10%', '10-25%', '25-50%', '50-75%', '75-90%', '90-100%']
-    )
-    discount_counts = discount_bins.value_counts().sort_index()
+    discounts = pd.to_numeric(df['discount_percentage'], errors='coerce').to_numpy(dtype=np.float64)
+    discounts = discounts[(discounts > 0) & (discounts <= 100)]
+    # side='left' keeps each upper edge in its own bucket, like pd.cut(right=True)
+    bins = np.searchsorted(DISCOUNT_BIN_EDGES, discounts, side='left') - 1
+    discount_counts = np.bincount(bins, minlength=len(DISCOUNT_BIN_LABELS))
 
     fig_dist = px.bar(
-        x=discount_counts.index,
-        y=discount_counts.values,
+        x=DISCOUNT_BIN_LABELS,
+        y=discount_counts,
         labels={'x': 'Discount Range', 'y': 'Number of Products'},
         title='Discount Distribution'
     )
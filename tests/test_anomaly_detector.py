@@ -0,0 +1,113 @@
+"""
+Tests for the anomaly detector.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis import anomaly_detector
+from src.analysis.anomaly_detector import AnomalyDetector
+
+
+def make_products():
+    """Small catalog with one hit per rule-based detector."""
+    return pd.DataFrame({
+        'name': ['TV A', 'TV B', 'TV C', 'TV D', 'TV E', 'Samsung TV X',
+                 'Toy 1', 'Toy 2', 'Apple Phone', 'Mystery'],
+        'category': ['tv'] * 6 + ['toys', 'toys', 'phone', None],
+        'current_price': [400.0, 420.0, 380.0, 410.0, 395.0, 400.0, 99.99, 25.0, 45.0, np.nan],
+        'original_price': [500.0, 450.0, 400.0, 420.0, 450.0, 2000.0, 199.99, 50.0, 6000.0, 300.0],
+        'discount_percentage': [20.0, 6.7, 5.0, 2.4, 12.2, 80.0, 50.0, 50.0, 99.25, 60.0],
+    })
+
+
+def test_fake_discount_detection():
+    """Test fake discount indicators and category median evidence."""
+    results = AnomalyDetector()._detect_fake_discounts(make_products())
+
+    assert len(results) == 1
+    result = results.iloc[0]
+    assert result['product_name'] == 'Samsung TV X'
+    assert result['anomaly_type'] == 'FAKE_DISCOUNT'
+    assert abs(result['confidence_score'] - 0.8) < 1e-9
+    assert result['evidence'] == [
+        'Original price is suspiciously round',
+        'Discount is a round percentage',
+        'Original price 2000.00 is 2.5x category median 400.00',
+        'Large discount but price is average for category',
+    ]
+
+
+def test_too_good_to_be_true_detection():
+    """Test too-good-to-be-true scoring."""
+    results = AnomalyDetector()._detect_too_good_to_be_true(make_products())
+
+    assert results['product_name'].tolist() == ['Apple Phone']
+    assert results['confidence_score'].iat[0] == 1.0
+    assert results['evidence'].iat[0] == [
+        'Extreme discount of 99.2%',
+        'Massive savings of 5955.00 DKK',
+        'Premium brand at suspiciously low price',
+        'Price dropped from 6000.00 to 45.00',
+    ]
+
+
+def test_price_manipulation_detection():
+    """Test doubled-price manipulation patterns."""
+    results = AnomalyDetector()._detect_price_manipulation(make_products())
+
+    assert results['product_name'].tolist() == ['Toy 1', 'Toy 2']
+    assert np.allclose(results['confidence_score'], 0.7)
+    for evidence in results['evidence']:
+        assert evidence == [
+            'Common manipulation discount: 50.0%',
+            'Original price appears to be exactly double current price',
+        ]
+
+
+def test_detect_anomalies_sorted_and_deduplicated():
+    """Test the combined result ordering."""
+    results = AnomalyDetector().detect_anomalies(make_products())
+
+    assert [r.product_name for r in results] == ['Apple Phone', 'Samsung TV X', 'Toy 1', 'Toy 2']
+    assert [r.anomaly_type for r in results] == [
+        'TOO_GOOD_TO_BE_TRUE', 'FAKE_DISCOUNT', 'PRICE_MANIPULATION', 'PRICE_MANIPULATION'
+    ]
+
+
+def test_detect_anomalies_empty_frame():
+    """Test that an empty frame yields no anomalies."""
+    assert AnomalyDetector().detect_anomalies(pd.DataFrame()) == []
+
+
+def kernel_discounts():
+    """Discounts with the edge cases the compiled kernels must agree on."""
+    rng = np.random.default_rng(7)
+    discounts = rng.uniform(-5.0, 100.0, 500)
+    discounts[::17] = np.nan
+    discounts[5:8] = [80.0, 90.0, 95.0]
+    discounts[9:12] = [0.0, np.inf, -np.inf]
+    return discounts
+
+
+def test_compiled_kernels_match_numpy():
+    """Each numba kernel agrees with its NumPy twin row for row."""
+    pytest.importorskip('numba')
+    discounts = kernel_discounts()
+
+    np.testing.assert_array_equal(anomaly_detector._discount_tiers(discounts),
+                                  anomaly_detector._discount_tiers_numpy(discounts))
+
+    deviations = discounts[np.isfinite(discounts)] - 40.0
+    for threshold, min_confidence in [(1.0, 0.0), (0.5, 0.3), (3.0, 0.8)]:
+        for actual, expected in zip(
+                anomaly_detector._zscore_hits(deviations, 20.0, threshold, min_confidence),
+                anomaly_detector._zscore_hits_numpy(deviations, 20.0, threshold, min_confidence)):
+            np.testing.assert_array_equal(actual, expected)
+
+    for upper_bound, iqr, min_confidence in [(60.0, 30.0, 0.0), (60.0, 0.0, 0.5), (90.0, 10.0, 0.9)]:
+        for actual, expected in zip(
+                anomaly_detector._iqr_hits(discounts, upper_bound, iqr, min_confidence),
+                anomaly_detector._iqr_hits_numpy(discounts, upper_bound, iqr, min_confidence)):
+            np.testing.assert_array_equal(actual, expected)
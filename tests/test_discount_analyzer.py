@@ -0,0 +1,136 @@
+"""
+Tests for the discount analyzer.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis import discount_analyzer
+from src.analysis.discount_analyzer import DiscountAnalyzer
+
+
+def make_products():
+    """Small catalog with one product per pricing error type."""
+    return pd.DataFrame({
+        'name': ['TV A', 'TV B', 'TV C', 'Glitch', 'Broken', 'Toy 1', 'Toy 2', 'Toy 3', 'Lamp'],
+        'category': ['tv', 'tv', 'tv', 'tv', 'toys', 'toys', 'toys', 'toys', None],
+        'current_price': [3999.0, 4499.0, 4199.0, 19.0, -5.0, 149.0, 139.0, 129.0, 250.0],
+        'original_price': [4999.0, 4999.0, 4999.0, 2000.0, 100.0, 199.0, 179.0, 149.0, 200.0],
+        'discount_percentage': [20.0, 10.0, 16.0, 99.05, 0.0, 25.0, 22.0, 40.0, 0.0],
+    })
+
+
+def test_pricing_errors_sorted_by_severity():
+    """Test pricing error detection and severity ordering."""
+    errors = DiscountAnalyzer()._detect_pricing_errors(make_products())
+
+    assert [(e['name'], e['type']) for e in errors] == [
+        ('Broken', 'NEGATIVE_PRICE'),
+        ('Glitch', 'EXTREME_DISCOUNT'),
+        ('Lamp', 'PRICE_INVERSION'),
+        ('Toy 3', 'DISCOUNT_MISMATCH'),
+    ]
+    assert errors[2]['description'] == "Current price (250.00) > Original price (200.00)"
+    assert errors[3]['description'] == "Claimed discount (40.0%) != Calculated (13.4%)"
+
+
+def test_analyze_empty_frame():
+    """Test that an empty frame yields an empty analysis."""
+    analysis = DiscountAnalyzer().analyze(pd.DataFrame())
+
+    assert analysis.total_products == 0
+    assert analysis.potential_errors == []
+
+
+def test_discount_distribution_bucket_edges():
+    """Test that bucket edges fall into the upper bucket."""
+    df = pd.DataFrame({'discount_percentage': [0.0, 5.0, 10.0, 25.0, 74.9, 90.0, 100.0]})
+
+    assert DiscountAnalyzer()._calculate_discount_distribution(df) == {
+        '0-10%': 1, '10-25%': 1, '25-50%': 1, '50-75%': 1, '75-90%': 0, '90%+': 2,
+    }
+
+
+def test_category_statistics():
+    """Test per-category benchmarks, skipping products without a category."""
+    stats = DiscountAnalyzer()._calculate_category_statistics(make_products())
+
+    assert list(stats) == ['tv', 'toys']
+    assert stats['toys'] == {
+        'mean_discount': 29.0,
+        'std_discount': stats['toys']['std_discount'],
+        'median_price': 139.0,
+        'mean_price': 139.0,
+        'percentile_90': 147.0,
+        'product_count': 4,
+    }
+    assert abs(stats['toys']['std_discount'] - 9.6436507609) < 1e-9
+
+
+def test_category_statistics_paths_agree(monkeypatch):
+    """The small-frame NumPy path and the groupby path give the same statistics."""
+    rng = np.random.default_rng(3)
+    n = 300
+    products = pd.DataFrame({
+        'category': rng.choice(['tv', 'toys', 'phone', None], n),
+        'current_price': rng.choice([-1.0, 0.0, np.nan, 49.0, 399.0, 1299.0], n),
+        'discount_percentage': rng.choice([0.0, np.nan, 12.5, 40.0, 95.0], n),
+    })
+    products.loc[0, 'category'] = 'single'
+    products.loc[1:4, 'category'] = 'unpriced'
+    products.loc[1:4, ['current_price', 'discount_percentage']] = 0.0
+    analyzer = DiscountAnalyzer()
+
+    small = analyzer._calculate_category_statistics(products)
+    monkeypatch.setattr(discount_analyzer, '_SMALL_FRAME_ROWS', 0)
+    grouped = analyzer._calculate_category_statistics(products)
+
+    assert list(small) == list(grouped)
+    for category, stats in small.items():
+        assert list(stats) == list(grouped[category])
+        assert stats == pytest.approx(grouped[category])
+
+
+def test_suspicious_deals_scoring():
+    """Test suspicion scoring and reasons for an unnaturally good deal."""
+    deals = DiscountAnalyzer()._detect_suspicious_deals(make_products())
+
+    assert [d['name'] for d in deals] == ['Glitch']
+    deal = deals[0]
+    assert deal['suspicion_score'] == 90
+    assert abs(deal['deal_quality'] - 87.3147190624) < 1e-9
+    assert deal['reasons'] == [
+        'Extreme discount: 99.0%',
+        'Price significantly below category median (19.00 vs 4099.00)',
+        'Suspiciously round original price: 2000.00',
+        'Exceptional deal quality score: 87/100',
+    ]
+    assert deal['recommendation'].startswith('⚠️ HIGHLY SUSPICIOUS')
+
+
+
+def test_compiled_deal_scores_match_numpy():
+    """The numba deal scorer agrees with its NumPy twin, NaN benchmarks included."""
+    pytest.importorskip('numba')
+    rng = np.random.default_rng(11)
+    n = 400
+    original = rng.choice([np.nan, 50.0, 100.0, 149.95, 999.0, 2500.0], n)
+    current = original * rng.uniform(0.0, 1.1, n)
+    discount = rng.uniform(0.0, 100.0, n)
+    discount[::13] = np.nan
+    discount[1:4] = [70.0, 80.0, 90.0]
+
+    # Every fifth product has no category statistics
+    mean_discount = rng.uniform(0.0, 50.0, n)
+    std_discount = rng.choice([0.0, 5.0, 20.0], n)
+    median_price = rng.choice([0.0, 500.0, 3000.0], n)
+    percentile_90 = rng.choice([100.0, 1000.0], n)
+    for benchmark in (mean_discount, std_discount, median_price, percentile_90):
+        benchmark[::5] = np.nan
+
+    arrays = (current, original, discount, mean_discount, std_discount,
+              median_price, percentile_90)
+    for actual, expected in zip(discount_analyzer._score_deals(*arrays),
+                                discount_analyzer._score_deals_numpy(*arrays)):
+        np.testing.assert_array_equal(actual, expected)
@@ -0,0 +1,33 @@
+"""
+Tests for the price validator.
+"""
+
+import pandas as pd
+
+from src.analysis.price_validator import PriceValidator
+
+
+def test_validate_splits_errors_and_warnings():
+    """Test that each product's findings keep validation order."""
+    products = pd.DataFrame({
+        'name': ['Good', 'Broken', 'Pricey', ''],
+        'current_price': [80.0, -5.0, 150000.0, 10.0],
+        'original_price': [100.0, 50.0, 200000.0, 5.0],
+        'discount_percentage': [20.0, 0.0, 40.0, 0.0],
+    })
+
+    report = PriceValidator().validate(products)
+
+    assert [(e['name'], e['type']) for e in report.errors] == [
+        ('Broken', 'PRICE_TOO_LOW'),
+        ('Broken', 'NEGATIVE_PRICE'),
+        ('', 'MISSING_DATA'),
+        ('', 'PRICE_INVERSION'),
+    ]
+    assert [(w['name'], w['type']) for w in report.warnings] == [
+        ('Pricey', 'PRICE_TOO_HIGH'),
+        ('Pricey', 'DISCOUNT_CALCULATION_ERROR'),
+    ]
+    assert report.warnings[1]['description'] == 'Discount mismatch: claimed 40.0%, calculated 25.0%'
+    assert report.invalid_products == 2
+    assert not report.validation_passed
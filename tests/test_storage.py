@@ -0,0 +1,74 @@
+"""
+Tests for data storage.
+"""
+
+from src.data.models import Base, PriceHistory, Product
+from src.data.storage import DataStorage
+
+
+def make_storage(tmp_path, name):
+    """Fresh SQLite-backed storage in the test's temporary directory."""
+    storage = DataStorage(f"sqlite:///{tmp_path / name}")
+    Base.metadata.create_all(storage.engine)
+    return storage
+
+
+def dump(storage):
+    """Stored products and price history, in insertion order."""
+    with storage.get_session() as session:
+        products = [(p.id, p.external_id, p.url, p.name, p.current_price)
+                    for p in session.query(Product).order_by(Product.id)]
+        history = [(h.product_id, h.price)
+                   for h in session.query(PriceHistory).order_by(PriceHistory.id)]
+    return products, history
+
+
+def test_bulk_store_matches_per_product_storage(tmp_path):
+    """Test that one-transaction storage ends in the same state as a commit per product."""
+    batches = [
+        [
+            {'name': 'TV A', 'external_id': 'a', 'url': 'u/a', 'current_price': 100.0},
+            {'name': 'TV B', 'url': 'u/b', 'current_price': 200.0},
+            {'name': 'Lamp', 'external_id': '', 'current_price': 30.0},
+            {'name': ''},
+        ],
+        [
+            # Matched by external_id, url and name, in that order of preference
+            {'name': 'TV A v2', 'external_id': 'a', 'current_price': 90.0},
+            {'name': 'TV B', 'external_id': 'b', 'url': 'u/b', 'current_price': 200.0},
+            {'name': 'Lamp', 'current_price': 25.0},
+            # A second empty external_id breaks the unique constraint
+            {'name': 'Chair', 'external_id': '', 'current_price': 50.0},
+            {'name': 'Desk', 'external_id': 'd', 'current_price': 80.0},
+        ],
+    ]
+    bulk = make_storage(tmp_path, 'bulk.db')
+    per_product = make_storage(tmp_path, 'per_product.db')
+
+    for batch in batches:
+        results = bulk.bulk_store([dict(product) for product in batch])
+        assert results == per_product.store_multiple_products([dict(product) for product in batch])
+        assert dump(bulk) == dump(per_product)
+
+    # The failing product is reported without rolling back the rest of the batch
+    assert results == {'successful': 4, 'failed': 1, 'errors': ['Chair']}
+
+
+def test_bulk_store_records_every_price_of_a_repeated_product(tmp_path):
+    """Test that a product listed twice in one batch gets a history row per price."""
+    batch = [
+        {'name': 'TV A', 'external_id': 'a', 'current_price': 100.0},
+        {'name': 'TV A', 'external_id': 'a', 'current_price': 100.0},
+        {'name': 'TV A', 'external_id': 'a', 'current_price': 90.0},
+    ]
+    bulk = make_storage(tmp_path, 'bulk.db')
+    per_product = make_storage(tmp_path, 'per_product.db')
+
+    assert bulk.bulk_store([dict(product) for product in batch]) == {
+        'successful': 3, 'failed': 0, 'errors': []
+    }
+    per_product.store_multiple_products([dict(product) for product in batch])
+
+    # The repeated 100.0 is not a new price; the change to 90.0 is
+    assert dump(bulk) == dump(per_product)
+    assert dump(bulk)[1] == [(1, 100.0), (1, 90.0)]